@@ -1,7 +1,61 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from django.contrib.auth import authenticate
-from oauth2_provider.models import Application, AccessToken
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.cache import cache
+from django.db import transaction, IntegrityError
+from oauth2_provider.models import Application
+import hmac
+
+# Seconds an OAuth2 application lookup is served from cache on login
+APPLICATION_CACHE_TIMEOUT = 60
+
+
+def get_cached_application(client_id):
+    """Look up an OAuth2 application by client ID, caching it briefly."""
+    return cache.get_or_set(
+        f'oauth_app:{client_id}',
+        lambda: Application.objects.only('id', 'client_id', 'client_secret', 'name').get(client_id=client_id),
+        APPLICATION_CACHE_TIMEOUT
+    )
+
+
+class UserRegistrationListSerializer(serializers.ListSerializer):
+    """
+    List serializer for registering several users with a single INSERT.
+    """
+
+    def validate(self, attrs):
+        """Reject usernames or emails repeated in the batch, and taken usernames."""
+        usernames = [User.normalize_username(item['username']) for item in attrs]
+        if len(set(usernames)) != len(usernames):
+            raise serializers.ValidationError("Each username may only appear once.")
+        emails = [item['email'].lower() for item in attrs if item.get('email')]
+        if len(set(emails)) != len(emails):
+            raise serializers.ValidationError("Each email may only appear once.")
+        taken = list(User.objects.filter(username__in=usernames).values_list('username', flat=True)[:1])
+        if taken:
+            raise serializers.ValidationError(f"A user with the username '{taken[0]}' already exists.")
+        return attrs
+
+    def create(self, validated_data):
+        """Create user accounts in bulk."""
+        users = [
+            User(
+                username=User.normalize_username(attrs['username']),
+                email=User.objects.normalize_email(attrs.get('email', '')),
+                first_name=attrs.get('first_name', ''),
+                last_name=attrs.get('last_name', ''),
+                password=make_password(attrs['password']),
+            )
+            for attrs in validated_data
+        ]
+        # Usernames were checked in validate(); the constraint catches races
+        try:
+            with transaction.atomic():
+                return User.objects.bulk_create(users, batch_size=500)
+        except IntegrityError:
+            raise serializers.ValidationError({'username': "A user with this username already exists."})
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -14,6 +68,9 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['username', 'email', 'first_name', 'last_name', 'password', 'confirm_password']
+        # Username uniqueness is enforced by the database; see create()
+        extra_kwargs = {'username': {'validators': [UnicodeUsernameValidator()]}}
+        list_serializer_class = UserRegistrationListSerializer
 
     def validate(self, attrs):
         """Validate password confirmation."""
@@ -23,24 +80,20 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def validate_email(self, value):
         """Validate email uniqueness."""
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter(email__iexact=value).exists():
             raise serializers.ValidationError("A user with this email already exists.")
         return value
 
-    def validate_username(self, value):
-        """Validate username uniqueness."""
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("A user with this username already exists.")
-        return value
-
     def create(self, validated_data):
         """Create user account."""
         validated_data.pop('confirm_password')
         password = validated_data.pop('password')
         
-        user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(password=password, **validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({'username': "A user with this username already exists."})
         
         return user
 
@@ -61,21 +114,22 @@ class UserLoginSerializer(serializers.Serializer):
         client_id = attrs.get('client_id')
         client_secret = attrs.get('client_secret')
 
-        # Authenticate user
-        user = authenticate(username=username, password=password)
-        if not user:
+        # Authenticate user; inactive accounts are excluded by the query itself
+        user = User.objects.filter(username=username, is_active=True).first()
+        if user is None:
+            # Run the hasher anyway so response time doesn't reveal unknown usernames
+            User().set_password(password)
+            raise serializers.ValidationError("Invalid username or password.")
+        if not user.check_password(password):
             raise serializers.ValidationError("Invalid username or password.")
-
-        if not user.is_active:
-            raise serializers.ValidationError("User account is deactivated.")
 
         # Validate OAuth2 application
         try:
-            application = Application.objects.get(client_id=client_id)
-            if application.client_secret != client_secret:
-                raise serializers.ValidationError("Invalid client credentials.")
+            application = get_cached_application(client_id)
         except Application.DoesNotExist:
             raise serializers.ValidationError("Invalid client credentials.")
+        if not hmac.compare_digest(application.client_secret.encode(), client_secret.encode()):
+            raise serializers.ValidationError("Invalid client credentials.")
 
         attrs['user'] = user
         attrs['application'] = application
@@ -112,15 +166,3 @@ class ChangePasswordSerializer(serializers.Serializer):
         if not user.check_password(value):
             raise serializers.ValidationError("Old password is incorrect.")
         return value
-
-
-class TokenInfoSerializer(serializers.ModelSerializer):
-    """
-    Serializer for access token information.
-    """
-    user = UserProfileSerializer(read_only=True)
-    scope = serializers.CharField(source='scope_names')
-
-    class Meta:
-        model = AccessToken
-        fields = ['token', 'expires', 'scope', 'user']
@@ -0,0 +1,90 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.exceptions import ValidationError
+from authentication.serializers import UserRegistrationSerializer
+
+
+class UserRegistrationSerializerTest(TestCase):
+    """Test cases for user registration serializers."""
+    
+    def test_bulk_registration(self):
+        """Test registering several users at once."""
+        data = [
+            {
+                'username': 'user1',
+                'email': 'user1@example.com',
+                'password': 'securepass123',
+                'confirm_password': 'securepass123'
+            },
+            {
+                'username': 'user2',
+                'email': 'user2@example.com',
+                'password': 'securepass123',
+                'confirm_password': 'securepass123'
+            }
+        ]
+        
+        serializer = UserRegistrationSerializer(data=data, many=True)
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        
+        self.assertEqual(User.objects.count(), 2)
+        user = User.objects.get(username='user1')
+        self.assertTrue(user.check_password('securepass123'))
+    
+    def test_bulk_registration_rejects_existing_username(self):
+        """Test that bulk registration rejects usernames already taken."""
+        User.objects.create_user(username='user1', password='password123')
+        data = [
+            {
+                'username': 'user1',
+                'email': 'other@example.com',
+                'password': 'securepass123',
+                'confirm_password': 'securepass123'
+            },
+            {
+                'username': 'user2',
+                'email': 'user2@example.com',
+                'password': 'securepass123',
+                'confirm_password': 'securepass123'
+            }
+        ]
+        
+        serializer = UserRegistrationSerializer(data=data, many=True)
+        self.assertFalse(serializer.is_valid())
+        
+        self.assertEqual(User.objects.count(), 1)
+        self.assertTrue(User.objects.get(username='user1').check_password('password123'))
+    
+    def test_bulk_registration_rejects_duplicates_in_batch(self):
+        """Test that a batch repeating a username or email is rejected."""
+        user = {
+            'username': 'user1',
+            'email': 'user1@example.com',
+            'password': 'securepass123',
+            'confirm_password': 'securepass123'
+        }
+        
+        for duplicate in ({'email': 'other@example.com'}, {'username': 'user2', 'email': 'USER1@example.com'}):
+            with self.subTest(duplicate=duplicate):
+                serializer = UserRegistrationSerializer(data=[user, {**user, **duplicate}], many=True)
+                self.assertFalse(serializer.is_valid())
+        
+        self.assertEqual(User.objects.count(), 0)
+    
+    def test_bulk_registration_username_taken_after_validation(self):
+        """Test a username taken between validation and save raises a validation error."""
+        data = [{
+            'username': 'user1',
+            'email': 'user1@example.com',
+            'password': 'securepass123',
+            'confirm_password': 'securepass123'
+        }]
+        serializer = UserRegistrationSerializer(data=data, many=True)
+        self.assertTrue(serializer.is_valid())
+        User.objects.create_user(username='user1', password='password123')
+        
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        
+        self.assertEqual(User.objects.count(), 1)
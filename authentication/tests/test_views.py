@@ -2,7 +2,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
-from oauth2_provider.models import Application, AccessToken
+from oauth2_provider.models import Application, AccessToken, RefreshToken
 from tests.conftest import AuthenticatedAPITestCase
 
 
@@ -64,6 +64,21 @@ class AuthenticationViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('email', response.data)
     
+    def test_user_registration_duplicate_username(self):
+        """Test user registration with duplicate username."""
+        User.objects.create_user(
+            username='testuser',
+            email='existing@example.com',
+            password='password123'
+        )
+        
+        url = reverse('register')
+        response = self.client.post(url, self.user_data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('username', response.data)
+        self.assertEqual(User.objects.count(), 1)
+    
     def test_user_login(self):
         """Test user login endpoint."""
         # Create user
@@ -102,6 +117,28 @@ class AuthenticationViewTest(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
+    def test_user_login_inactive_user(self):
+        """Test user login with a deactivated account."""
+        User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            is_active=False
+        )
+        
+        login_data = {
+            'username': 'testuser',
+            'password': 'testpass123',
+            'client_id': self.application.client_id,
+            'client_secret': self.application.client_secret
+        }
+        
+        url = reverse('login')
+        response = self.client.post(url, login_data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(AccessToken.objects.exists())
+    
     def test_user_login_invalid_client(self):
         """Test user login with invalid client credentials."""
         user = User.objects.create_user(
@@ -122,6 +159,26 @@ class AuthenticationViewTest(APITestCase):
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
+    def test_user_login_wrong_client_secret(self):
+        """Test user login with a valid client ID but wrong secret."""
+        User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        
+        login_data = {
+            'username': 'testuser',
+            'password': 'testpass123',
+            'client_id': self.application.client_id,
+            'client_secret': 'wrong_secret'
+        }
+        
+        url = reverse('login')
+        response = self.client.post(url, login_data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
     def test_create_oauth_application(self):
         """Test creating OAuth2 application."""
         url = reverse('create_app')
@@ -186,6 +243,27 @@ class AuthenticatedViewTest(AuthenticatedAPITestCase):
         # Check that access tokens are revoked
         self.assertFalse(AccessToken.objects.filter(user=self.user).exists())
     
+    def test_change_password_revokes_refresh_tokens(self):
+        """Test changing password also revokes linked refresh tokens."""
+        RefreshToken.objects.create(
+            user=self.user,
+            application=self.application,
+            token='refresh-token',
+            access_token=self.access_token
+        )
+        
+        url = reverse('change_password')
+        data = {
+            'old_password': 'testpass123',
+            'new_password': 'newpassword123',
+            'confirm_password': 'newpassword123'
+        }
+        response = self.client.post(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(AccessToken.objects.filter(user=self.user).exists())
+        self.assertFalse(RefreshToken.objects.filter(user=self.user).exists())
+    
     def test_change_password_wrong_old_password(self):
         """Test changing password with wrong old password."""
         url = reverse('change_password')
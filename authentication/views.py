@@ -1,27 +1,58 @@
 from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, SAFE_METHODS
 from django.contrib.auth.models import User
-from oauth2_provider.models import Application, AccessToken
+from oauth2_provider.models import Application, AccessToken, RefreshToken
 from oauth2_provider import views as oauth2_views
-from oauth2_provider.generators import generate_client_secret
 from datetime import datetime, timedelta
+from django.db import router, transaction
 from django.utils import timezone
+from functools import lru_cache
 import requests
 import logging
+import re
+import secrets
+import time
 import uuid
 
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
     UserProfileSerializer,
-    ChangePasswordSerializer,
-    TokenInfoSerializer
+    ChangePasswordSerializer
 )
 
 logger = logging.getLogger(__name__)
 
+_BEARER = re.compile(r'^Bearer (\S+)$')
+
+ACCESS_TOKEN_LIFETIME = timedelta(seconds=3600)  # 1 hour
+
+
+def _serialize_user(user):
+    """Build the user profile payload directly, without a DRF serializer."""
+    last_login = user.last_login
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'date_joined': timezone.localtime(user.date_joined).isoformat(),
+        'last_login': timezone.localtime(last_login).isoformat() if last_login else None,
+    }
+
+
+def _serialize_token(access_token):
+    """Build the token info payload directly, without a DRF serializer."""
+    return {
+        'token': access_token.token,
+        'expires': timezone.localtime(access_token.expires).isoformat(),
+        'scope': access_token.scope,
+        'user': _serialize_user(access_token.user)
+    }
+
 
 class UserRegistrationView(generics.CreateAPIView):
     """
@@ -37,11 +68,11 @@ class UserRegistrationView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
-        logger.info(f"New user registered: {user.username}")
+        logger.info("New user registered: %s", user.username)
         
         return Response({
             'message': 'User registered successfully',
-            'user': UserProfileSerializer(user).data
+            'user': _serialize_user(user)
         }, status=status.HTTP_201_CREATED)
 
 
@@ -61,17 +92,17 @@ def login_view(request):
     access_token = AccessToken.objects.create(
         user=user,
         application=application,
-        token=generate_client_secret(),  # Use oauth2_provider token generator
-        expires=timezone.now() + timedelta(seconds=3600),  # 1 hour
+        token=secrets.token_urlsafe(48),
+        expires=timezone.now() + ACCESS_TOKEN_LIFETIME,
         scope='read write'
     )
     
-    logger.info(f"User logged in: {user.username}")
+    logger.info("User logged in: %s", user.username)
     
     return Response({
         'access_token': access_token.token,
         'token_type': 'Bearer',
-        'expires_in': 3600,
+        'expires_in': int(ACCESS_TOKEN_LIFETIME.total_seconds()),
         'scope': 'read write',
         'user': UserProfileSerializer(user).data
     })
@@ -83,21 +114,13 @@ def logout_view(request):
     """
     API endpoint for user logout (token revocation).
     """
-    try:
-        # Get the token from the request
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-            
-            # Revoke the token
-            access_token = AccessToken.objects.get(token=token)
-            access_token.delete()
-            
-            logger.info(f"User logged out: {request.user.username}")
-            
-            return Response({'message': 'Logout successful'})
-    except AccessToken.DoesNotExist:
-        pass
+    # Get the token from the request
+    match = _BEARER.match(request.META.get('HTTP_AUTHORIZATION', ''))
+    if match:
+        # Revoke the token without loading it first
+        deleted, _ = AccessToken.objects.filter(token=match.group(1)).delete()
+        if deleted:
+            logger.info("User logged out: %s", request.user.username)
     
     return Response({'message': 'Logout successful'})
 
@@ -110,7 +133,13 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        if self.request.method in SAFE_METHODS:
+            return self.request.user
+        # For updates, load only the profile columns so save() rewrites just
+        # those instead of every auth_user column (password hash included).
+        return User.objects.only(
+            'id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'last_login'
+        ).get(pk=self.request.user.pk)
 
 
 @api_view(['POST'])
@@ -124,12 +153,16 @@ def change_password_view(request):
     
     user = request.user
     user.set_password(serializer.validated_data['new_password'])
-    user.save()
+    user.save(update_fields=['password'])
     
-    # Revoke all existing tokens for security
-    AccessToken.objects.filter(user=user).delete()
+    # Revoke all existing tokens for security. Refresh tokens pointing at the
+    # access tokens go first, so the access tokens can then be removed with a
+    # single DELETE instead of going through the cascade collector.
+    with transaction.atomic():
+        RefreshToken.objects.filter(access_token__user=user).delete()
+        AccessToken.objects.filter(user=user)._raw_delete(router.db_for_write(AccessToken))
     
-    logger.info(f"Password changed for user: {user.username}")
+    logger.info("Password changed for user: %s", user.username)
     
     return Response({'message': 'Password changed successfully'})
 
@@ -140,17 +173,21 @@ def token_info_view(request):
     """
     API endpoint for getting information about the current token.
     """
+    match = _BEARER.match(request.META.get('HTTP_AUTHORIZATION', ''))
+    if not match:
+        return Response({'error': 'Invalid token'}, status=status.HTTP_401_UNAUTHORIZED)
+
     try:
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if auth_header.startswith('Bearer '):
-            token = auth_header.split(' ')[1]
-            access_token = AccessToken.objects.get(token=token)
-            
-            serializer = TokenInfoSerializer(access_token)
-            return Response(serializer.data)
+        access_token = AccessToken.objects.select_related('user').only(
+            'token', 'expires', 'scope',
+            'user__id', 'user__username', 'user__email', 'user__first_name',
+            'user__last_name', 'user__date_joined', 'user__last_login'
+        ).get(token=match.group(1))
     except AccessToken.DoesNotExist:
         return Response({'error': 'Invalid token'}, status=status.HTTP_401_UNAUTHORIZED)
 
+    return Response(_serialize_token(access_token))
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -180,8 +217,14 @@ def health_check_view(request):
     """
     Health check endpoint for the authentication service.
     """
-    return Response({
+    return Response(_health_payload(int(time.time())))
+
+
+@lru_cache(maxsize=1)
+def _health_payload(second):
+    """Build the health check body once per wall-clock second."""
+    return {
         'status': 'healthy',
         'service': 'authentication',
-        'timestamp': datetime.now().isoformat()
-    })
+        'timestamp': datetime.fromtimestamp(second).isoformat()
+    }
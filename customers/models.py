@@ -1,8 +1,51 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Sum, Value, DecimalField
+from django.db.models.functions import Coalesce, Lower
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
+from decimal import Decimal
+import re
+import secrets
 import uuid
 
+from savannah_microservice.unique_fields import assign_unique_values, save_with_unique_retry
+
+# International phone number format, compiled once at import
+_PHONE_RE = re.compile(r'^\+?1?\d{9,15}\Z')
+
+# Attempts at drawing a free customer code before giving up on save
+CODE_GENERATION_ATTEMPTS = 3
+
+
+class CustomerQuerySet(models.QuerySet):
+    """
+    QuerySet with helpers for customer order statistics.
+    """
+
+    def with_totals(self):
+        """Annotate each customer with order count and amount spent in one query."""
+        return self.annotate(
+            total_orders_annot=Count('orders'),
+            total_spent_annot=Coalesce(
+                Sum('orders__amount'),
+                Value(Decimal('0')),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
+    def bulk_create_customers(self, data_list, batch_size=1000):
+        """Create customers from a list of field dicts with batched INSERTs."""
+        customers = [self.model(**data) for data in data_list]
+
+        assign_unique_values(self, customers, 'code', Customer.generate_customer_code)
+
+        with transaction.atomic():
+            return self.bulk_create(customers, batch_size=batch_size)
+
+    def with_email(self, email):
+        """Filter by email, ignoring case, through the lowercase email index."""
+        return self.alias(email_lower=Lower('email')).filter(email_lower=Lower(Value(email)))
+
 
 class Customer(models.Model):
     """
@@ -19,7 +62,7 @@ class Customer(models.Model):
     
     # Phone number with validation for international format
     phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
+        regex=_PHONE_RE,
         message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
     )
     phone_number = models.CharField(
@@ -41,42 +84,75 @@ class Customer(models.Model):
         help_text="Associated user account"
     )
 
+    objects = CustomerQuerySet.as_manager()
+
     class Meta:
         db_table = 'customers'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['code']),
             models.Index(fields=['email']),
+            models.Index(Lower('email'), name='cust_email_lower_idx'),
             models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored name so saves can tell whether it changed;
+        # left unset when the name was deferred
+        if 'name' in instance.__dict__:
+            instance._saved_name = instance.name
+        return instance
+
     def save(self, *args, **kwargs):
+        if self.code:
+            update_fields = kwargs.get('update_fields')
+            rename = (
+                not self._state.adding
+                and (update_fields is None or 'name' in update_fields)
+                and self.name != getattr(self, '_saved_name', None)
+            )
+            if rename:
+                # Rename the customer and its orders together or not at all
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                    self._sync_order_names()
+            else:
+                super().save(*args, **kwargs)
+            if update_fields is None or 'name' in update_fields:
+                self._saved_name = self.name
+            return
+
         # Auto-generate customer code if not provided
-        if not self.code:
-            self.code = self.generate_customer_code()
-        super().save(*args, **kwargs)
+        save_with_unique_retry(
+            self, 'code', Customer.generate_customer_code, CODE_GENERATION_ATTEMPTS,
+            lambda: super(Customer, self).save(*args, **kwargs)
+        )
+        self._saved_name = self.name
+
+    def _sync_order_names(self):
+        """Copy a renamed customer's name onto the orders that denormalize it."""
+        self.orders.exclude(customer_name=self.name).update(customer_name=self.name)
 
     def generate_customer_code(self):
-        """Generate a unique customer code."""
-        import random
-        import string
-        
-        while True:
-            code = 'CUST' + ''.join(random.choices(string.digits, k=6))
-            if not Customer.objects.filter(code=code).exists():
-                return code
+        """Generate a candidate customer code."""
+        return f"CUST{secrets.randbelow(10 ** 6):06d}"
 
     @property
     def total_orders(self):
         """Get total number of orders for this customer."""
+        if hasattr(self, 'total_orders_annot'):
+            return self.total_orders_annot
         return self.orders.count()
 
     @property
     def total_spent(self):
         """Get total amount spent by this customer."""
-        from django.db.models import Sum
+        if hasattr(self, 'total_spent_annot'):
+            return self.total_spent_annot
         total = self.orders.aggregate(total=Sum('amount'))['total']
         return total or 0
@@ -1,5 +1,7 @@
+from datetime import datetime
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import transaction, IntegrityError
 from .models import Customer
 
 
@@ -20,14 +22,12 @@ class CustomerSerializer(serializers.ModelSerializer):
 
     def validate_email(self, value):
         """Validate that email is unique."""
+        customers = Customer.objects.with_email(value)
         if self.instance:
             # For updates, exclude current instance
-            if Customer.objects.filter(email=value).exclude(pk=self.instance.pk).exists():
-                raise serializers.ValidationError("A customer with this email already exists.")
-        else:
-            # For creation
-            if Customer.objects.filter(email=value).exists():
-                raise serializers.ValidationError("A customer with this email already exists.")
+            customers = customers.exclude(pk=self.instance.pk)
+        if customers.exists():
+            raise serializers.ValidationError("A customer with this email already exists.")
         return value
 
     def validate_phone_number(self, value):
@@ -49,6 +49,9 @@ class CustomerCreateSerializer(serializers.ModelSerializer):
         fields = [
             'name', 'email', 'phone_number', 'password', 'confirm_password'
         ]
+        # Uniqueness is checked case-insensitively in validate_email(); the
+        # database constraint catches races, see create()
+        extra_kwargs = {'email': {'validators': []}}
 
     def validate(self, attrs):
         """Validate password confirmation."""
@@ -57,10 +60,10 @@ class CustomerCreateSerializer(serializers.ModelSerializer):
         return attrs
 
     def validate_email(self, value):
-        """Validate that email is unique."""
-        if Customer.objects.filter(email=value).exists():
+        """Validate that no customer or user account already uses this email."""
+        if Customer.objects.with_email(value).exists():
             raise serializers.ValidationError("A customer with this email already exists.")
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter(email__iexact=value).exists():
             raise serializers.ValidationError("A user with this email already exists.")
         return value
 
@@ -68,18 +71,23 @@ class CustomerCreateSerializer(serializers.ModelSerializer):
         """Create customer with associated user account."""
         password = validated_data.pop('password')
         validated_data.pop('confirm_password')
+        name_parts = (validated_data.get('name') or '').split(maxsplit=1)
         
-        # Create user account
-        user = User.objects.create_user(
-            username=validated_data['email'],
-            email=validated_data['email'],
-            password=password,
-            first_name=validated_data['name'].split()[0] if validated_data['name'] else '',
-            last_name=' '.join(validated_data['name'].split()[1:]) if len(validated_data['name'].split()) > 1 else ''
-        )
-        
-        # Create customer
-        customer = Customer.objects.create(user=user, **validated_data)
+        try:
+            with transaction.atomic():
+                # Create user account
+                user = User.objects.create_user(
+                    username=validated_data['email'],
+                    email=validated_data['email'],
+                    password=password,
+                    first_name=name_parts[0] if name_parts else '',
+                    last_name=name_parts[1] if len(name_parts) > 1 else ''
+                )
+                
+                # Create customer
+                customer = Customer.objects.create(user=user, **validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({'email': "A customer with this email already exists."})
         return customer
 
 
@@ -90,3 +98,21 @@ class CustomerListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Customer
         fields = ['id', 'code', 'name', 'email', 'created_at']
+        read_only_fields = fields
+
+
+# Renders datetimes in the current time zone, as the serializers do
+_DATETIME_FIELD = serializers.DateTimeField()
+
+
+def format_row(row):
+    """Return a plain row with its datetimes formatted as a serializer would."""
+    return {
+        key: _DATETIME_FIELD.to_representation(value) if isinstance(value, datetime) else value
+        for key, value in row.items()
+    }
+
+
+def customer_summary(customer):
+    """Return the CustomerListSerializer fields of `customer` as a plain dict."""
+    return format_row({field: getattr(customer, field) for field in CustomerListSerializer.Meta.fields})
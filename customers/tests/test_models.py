@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from unittest.mock import patch
 from customers.models import Customer
 
 
@@ -56,6 +57,51 @@ class CustomerModelTest(TestCase):
         
         self.assertNotEqual(customer1.code, customer2.code)
         
+    def test_customer_code_collision_retries(self):
+        """Test that a colliding generated code is replaced on save."""
+        existing = Customer.objects.create(
+            name='Customer 1',
+            email='customer1@example.com',
+            phone_number='+254700123456'
+        )
+        
+        with patch.object(
+            Customer, 'generate_customer_code',
+            side_effect=[existing.code, 'CUST000001']
+        ):
+            customer = Customer.objects.create(
+                name='Customer 2',
+                email='customer2@example.com',
+                phone_number='+254700123457'
+            )
+        
+        self.assertEqual(customer.code, 'CUST000001')
+        
+    def test_bulk_create_customers(self):
+        """Test bulk customer creation assigns unique codes."""
+        existing = Customer.objects.create(
+            name='Customer 1',
+            email='customer1@example.com',
+            phone_number='+254700123456'
+        )
+        data_list = [
+            {'name': 'Customer 2', 'email': 'customer2@example.com', 'phone_number': '+254700123457'},
+            {'name': 'Customer 3', 'email': 'customer3@example.com', 'phone_number': '+254700123458'},
+        ]
+        
+        with patch.object(
+            Customer, 'generate_customer_code',
+            side_effect=[existing.code, 'CUST000002', 'CUST000002', 'CUST000003']
+        ):
+            customers = Customer.objects.bulk_create_customers(data_list)
+        
+        self.assertEqual(len(customers), 2)
+        self.assertEqual(Customer.objects.count(), 3)
+        self.assertEqual(
+            set(Customer.objects.exclude(pk=existing.pk).values_list('code', flat=True)),
+            {'CUST000002', 'CUST000003'}
+        )
+        
     def test_customer_email_uniqueness(self):
         """Test that customer emails must be unique."""
         Customer.objects.create(
@@ -93,6 +93,32 @@ class CustomerSerializerTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn('email', serializer.errors)
     
+    def test_email_uniqueness_ignores_case(self):
+        """Test email uniqueness validation is case-insensitive."""
+        duplicate_data = {
+            'name': 'Another Customer',
+            'email': 'JOHN@example.com',
+            'phone_number': '+254700123457'
+        }
+        
+        serializer = CustomerSerializer(data=duplicate_data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('email', serializer.errors)
+    
+    def test_create_serializer_email_uniqueness_ignores_case(self):
+        """Test CustomerCreateSerializer rejects an existing email in another case."""
+        data = {
+            'name': 'Another Customer',
+            'email': 'JOHN@example.com',
+            'phone_number': '+254700123457',
+            'password': 'securepass123',
+            'confirm_password': 'securepass123'
+        }
+        
+        serializer = CustomerCreateSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('email', serializer.errors)
+    
     def test_phone_number_validation(self):
         """Test phone number validation."""
         # Test without country code
@@ -1,9 +1,13 @@
+from decimal import Decimal
+import uuid
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.settings import api_settings
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
 from customers.models import Customer
-from tests.conftest import AuthenticatedAPITestCase
+from orders.models import Order
+from tests.conftest import AuthenticatedAPITestCase, make_customers
 
 
 class CustomerViewSetTest(AuthenticatedAPITestCase):
@@ -49,22 +53,31 @@ class CustomerViewSetTest(AuthenticatedAPITestCase):
         self.assertEqual(Customer.objects.count(), 1)
         self.assertEqual(User.objects.count(), 2)  # Original user + new user
     
-    def test_list_customers(self):
-        """Test listing customers."""
-        # Create test customers
+    def test_create_customer_duplicate_email(self):
+        """Test creating a customer with an email that is already taken."""
         Customer.objects.create(
-            name='Customer 1',
-            email='customer1@example.com',
+            name='Existing Customer',
+            email='john@example.com',
             phone_number='+254700123456'
         )
-        Customer.objects.create(
-            name='Customer 2',
-            email='customer2@example.com',
-            phone_number='+254700123457'
-        )
         
         url = reverse('customer-list')
-        response = self.client.get(url)
+        response = self.client.post(url, self.customer_data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+        self.assertEqual(Customer.objects.count(), 1)
+        self.assertEqual(User.objects.count(), 1)  # No orphaned user account
+    
+    def test_list_customers(self):
+        """Test listing customers."""
+        # Create test customers
+        make_customers(2)
+        
+        url = reverse('customer-list')
+        # Token, count and page
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2)
@@ -78,11 +91,67 @@ class CustomerViewSetTest(AuthenticatedAPITestCase):
         )
         
         url = reverse('customer-detail', kwargs={'pk': customer.pk})
-        response = self.client.get(url)
+        # Token and annotated customer
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['name'], 'John Doe')
     
+    def test_list_and_search_datetime_format_matches_retrieve(self):
+        """Test list and search rows format datetimes like the detail view."""
+        customer = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+        
+        detail = self.client.get(reverse('customer-detail', kwargs={'pk': customer.pk})).json()
+        listed = self.client.get(reverse('customer-list')).json()['results'][0]
+        found = self.client.get(reverse('customer-search'), {'q': 'John'}).json()['results'][0]
+        
+        self.assertEqual(listed['created_at'], detail['created_at'])
+        self.assertEqual(found['created_at'], detail['created_at'])
+    
+    def test_retrieve_customer_order_totals(self):
+        """Test that retrieved customer includes annotated order totals."""
+        customer = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+        Order.objects.create(customer=customer, item='Product 1', amount=Decimal('50.00'))
+        Order.objects.create(customer=customer, item='Product 2', amount=Decimal('75.00'))
+        
+        url = reverse('customer-detail', kwargs={'pk': customer.pk})
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_orders'], 2)
+        self.assertEqual(response.data['total_spent'], Decimal('125.00'))
+    
+    def test_customer_orders_paginated(self):
+        """Test that customer orders are paginated without per-order queries."""
+        customer = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+        Order.objects.bulk_create_orders([
+            {'customer': customer, 'item': f'Product {i}', 'amount': Decimal('10.00')}
+            for i in range(3)
+        ])
+        
+        url = reverse('customer-orders', kwargs={'pk': customer.pk})
+        # Token, customer, order count and order page
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(response.data['results'][0]['customer_details']['code'], customer.code)
+    
     def test_update_customer(self):
         """Test updating a customer."""
         customer = Customer.objects.create(
@@ -133,6 +202,27 @@ class CustomerViewSetTest(AuthenticatedAPITestCase):
         self.assertEqual(response.data['count'], 1)
         self.assertEqual(response.data['results'][0]['name'], 'John Doe')
     
+    def test_search_customers_query_count(self):
+        """Test that search runs a single customer query."""
+        Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+        Customer.objects.create(
+            name='Johnny Walker',
+            email='johnny@example.com',
+            phone_number='+254700123457'
+        )
+        
+        url = reverse('customer-search')
+        # One query authenticates the token, one fetches the customers
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'q': 'John'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+    
     def test_customer_stats(self):
         """Test customer statistics endpoint."""
         customer = Customer.objects.create(
@@ -142,12 +232,98 @@ class CustomerViewSetTest(AuthenticatedAPITestCase):
         )
         
         url = reverse('customer-stats', kwargs={'pk': customer.pk})
-        response = self.client.get(url)
+        # Token, customer and order aggregate
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('statistics', response.data)
         self.assertEqual(response.data['statistics']['total_orders'], 0)
     
+    def test_customer_stats_with_orders(self):
+        """Test customer statistics are aggregated from the customer's orders."""
+        customer = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+        Order.objects.create(customer=customer, item='Product 1', amount=Decimal('50.00'))
+        Order.objects.create(customer=customer, item='Product 2', amount=Decimal('100.00'))
+        
+        url = reverse('customer-stats', kwargs={'pk': customer.pk})
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['customer']['code'], customer.code)
+        self.assertEqual(response.data['statistics']['total_orders'], 2)
+        self.assertEqual(response.data['statistics']['total_spent'], 150.0)
+        self.assertEqual(response.data['statistics']['average_order_value'], 75.0)
+    
+    def test_customer_stats_datetime_format_matches_retrieve(self):
+        """Test the stats customer summary formats datetimes like the detail view."""
+        customer = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+        
+        detail = self.client.get(reverse('customer-detail', kwargs={'pk': customer.pk})).json()
+        response = self.client.get(reverse('customer-stats', kwargs={'pk': customer.pk}))
+        
+        self.assertEqual(response.json()['customer']['created_at'], detail['created_at'])
+    
+    def test_customer_stats_bulk(self):
+        """Test statistics for several customers in one request."""
+        customer1, customer2 = make_customers(2)
+        Order.objects.create(customer=customer1, item='Product 1', amount=Decimal('50.00'))
+        Order.objects.create(customer=customer1, item='Product 2', amount=Decimal('100.00'))
+        
+        url = reverse('customer-stats-bulk')
+        # Token, customers and grouped order aggregate
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {'ids': f'{customer1.pk},{customer2.pk}'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = {row['customer']['code']: row['statistics'] for row in response.data}
+        self.assertEqual(stats[customer1.code]['total_orders'], 2)
+        self.assertEqual(stats[customer1.code]['total_spent'], 150.0)
+        self.assertEqual(stats[customer2.code]['total_orders'], 0)
+        self.assertEqual(stats[customer2.code]['average_order_value'], 0.0)
+    
+    def test_customer_stats_bulk_datetime_format_matches_retrieve(self):
+        """Test bulk statistics customer rows format datetimes like the detail view."""
+        customer, = make_customers(1)
+        
+        detail = self.client.get(reverse('customer-detail', kwargs={'pk': customer.pk})).json()
+        response = self.client.get(reverse('customer-stats-bulk'), {'ids': str(customer.pk)})
+        
+        self.assertEqual(response.json()[0]['customer']['created_at'], detail['created_at'])
+    
+    def test_customer_stats_bulk_keeps_requested_order(self):
+        """Test bulk statistics are returned in the order the IDs were requested."""
+        customers = make_customers(3)
+        ids = [customers[1].pk, customers[2].pk, customers[0].pk]
+        
+        response = self.client.get(reverse('customer-stats-bulk'), {'ids': ','.join(map(str, ids))})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['customer']['id'] for row in response.data], ids)
+    
+    def test_customer_stats_bulk_too_many_ids(self):
+        """Test bulk statistics rejects more IDs than fit on a page."""
+        ids = ','.join(str(uuid.uuid4()) for _ in range(api_settings.PAGE_SIZE + 1))
+        
+        response = self.client.get(reverse('customer-stats-bulk'), {'ids': ids})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_customer_stats_bulk_invalid_ids(self):
+        """Test bulk statistics rejects malformed customer IDs."""
+        url = reverse('customer-stats-bulk')
+        response = self.client.get(url, {'ids': 'not-a-uuid'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
     def test_unauthenticated_access_restricted(self):
         """Test that unauthenticated users can't access most endpoints."""
         customer = Customer.objects.create(
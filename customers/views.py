@@ -2,14 +2,25 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Q, Sum, Count, Avg, Value, DecimalField
+from django.db.models.functions import Coalesce
+from orders.models import Order
+from orders.serializers import OrderSerializer
 from .models import Customer
 from .serializers import (
     CustomerSerializer,
     CustomerCreateSerializer,
-    CustomerListSerializer
+    CustomerListSerializer,
+    customer_summary,
+    format_row
 )
+from decimal import Decimal
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
 
 
 class CustomerViewSet(viewsets.ModelViewSet):
@@ -27,6 +38,16 @@ class CustomerViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'created_at', 'updated_at']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        """Annotate order totals or narrow columns to what each action renders."""
+        queryset = super().get_queryset()
+        if self.action in ('retrieve', 'update', 'partial_update'):
+            queryset = queryset.with_totals()
+        elif self.action in ('orders', 'stats'):
+            # Only the summary fields are rendered for the customer here
+            queryset = queryset.only(*CustomerListSerializer.Meta.fields)
+        return queryset
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'create':
@@ -35,6 +56,14 @@ class CustomerViewSet(viewsets.ModelViewSet):
             return CustomerListSerializer
         return CustomerSerializer
 
+    def list(self, request, *args, **kwargs):
+        """List customers as plain rows, skipping per-object serialization."""
+        queryset = self.filter_queryset(self.get_queryset()).values(*CustomerListSerializer.Meta.fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response([format_row(row) for row in page])
+        return Response([format_row(row) for row in queryset])
+
     def get_permissions(self):
         """Allow unauthenticated access for customer registration."""
         if self.action == 'create':
@@ -47,16 +76,19 @@ class CustomerViewSet(viewsets.ModelViewSet):
         """Create customer and handle any additional logic."""
         customer = serializer.save()
         # Log customer creation
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"New customer created: {customer.code} - {customer.name}")
+        logger.info("New customer created: %s - %s", customer.code, customer.name)
 
     @action(detail=True, methods=['get'])
     def orders(self, request, pk=None):
-        """Get all orders for a specific customer."""
+        """Get all orders for a specific customer, one page at a time."""
         customer = self.get_object()
-        from orders.serializers import OrderSerializer
+        # The related manager already attaches the customer to each order,
+        # so customer_details needs no extra queries.
         orders = customer.orders.all()
+        page = self.paginate_queryset(orders)
+        if page is not None:
+            serializer = OrderSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = OrderSerializer(orders, many=True)
         return Response(serializer.data)
 
@@ -73,32 +105,85 @@ class CustomerViewSet(viewsets.ModelViewSet):
             Q(email__icontains=query) |
             Q(code__icontains=query) |
             Q(phone_number__icontains=query)
-        )
+        ).values(*CustomerListSerializer.Meta.fields)
 
-        serializer = CustomerListSerializer(customers, many=True)
+        # Evaluate once and count the rows in memory rather than issuing a COUNT
+        results = [format_row(row) for row in customers]
         return Response({
-            'count': customers.count(),
-            'results': serializer.data
+            'count': len(results),
+            'results': results
         })
 
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         """Get customer statistics."""
         customer = self.get_object()
-        from django.db.models import Sum, Count, Avg
-        from orders.models import Order
         
+        zero = Value(Decimal('0'))
         stats = Order.objects.filter(customer=customer).aggregate(
             total_orders=Count('id'),
-            total_spent=Sum('amount'),
-            average_order_value=Avg('amount')
+            total_spent=Coalesce(Sum('amount'), zero, output_field=DecimalField()),
+            average_order_value=Coalesce(Avg('amount'), zero, output_field=DecimalField())
         )
         
         return Response({
-            'customer': CustomerListSerializer(customer).data,
+            'customer': customer_summary(customer),
             'statistics': {
-                'total_orders': stats['total_orders'] or 0,
-                'total_spent': float(stats['total_spent'] or 0),
-                'average_order_value': float(stats['average_order_value'] or 0),
+                'total_orders': stats['total_orders'],
+                'total_spent': float(stats['total_spent']),
+                'average_order_value': float(stats['average_order_value']),
             }
         })
+
+    @action(detail=False, methods=['get'])
+    def stats_bulk(self, request):
+        """Get statistics for several customers at once, e.g. ?ids=<uuid>,<uuid>."""
+        try:
+            ids = [uuid.UUID(value) for value in request.query_params.get('ids', '').split(',') if value]
+        except ValueError:
+            return Response(
+                {'error': 'Query parameter "ids" must be a comma-separated list of customer IDs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not ids:
+            return Response(
+                {'error': 'Query parameter "ids" is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Dedupe, keeping the requested order, and cap the IN list at a page
+        ids = list(dict.fromkeys(ids))
+        if len(ids) > api_settings.PAGE_SIZE:
+            return Response(
+                {'error': f'At most {api_settings.PAGE_SIZE} customer IDs may be requested at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        customers = {
+            customer['id']: customer
+            for customer in Customer.objects.filter(id__in=ids).values(*CustomerListSerializer.Meta.fields)
+        }
+        totals = {
+            row['customer_id']: row
+            for row in Order.objects.filter(customer_id__in=ids).values('customer_id').annotate(
+                total_orders=Count('id'),
+                total_spent=Sum('amount'),
+                average_order_value=Avg('amount')
+            )
+        }
+
+        # Results follow the order the IDs were requested in; unknown IDs are skipped
+        results = []
+        for customer_id in ids:
+            customer = customers.get(customer_id)
+            if customer is None:
+                continue
+            row = totals.get(customer_id, {})
+            results.append({
+                'customer': format_row(customer),
+                'statistics': {
+                    'total_orders': row.get('total_orders', 0),
+                    'total_spent': float(row.get('total_spent', 0)),
+                    'average_order_value': float(row.get('average_order_value', 0)),
+                }
+            })
+        return Response(results)
@@ -0,0 +1,80 @@
+from django.core.cache import cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerError(Exception):
+    """Raised when a call is refused because the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to an external provider.
+
+    State lives in the Django cache, so workers share the circuit when the
+    cache is shared (Redis, see CACHES in settings). After `fail_max`
+    failures within `failure_window` seconds the circuit opens and calls fail
+    immediately for `reset_timeout` seconds. After that a single caller is
+    let through as a trial while the others keep failing fast; the trial
+    either closes the circuit again or re-opens it.
+    """
+
+    def __init__(self, name, fail_max=5, reset_timeout=30, failure_window=60):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failure_window = failure_window
+        self._failures_key = f'circuit:{name}:failures'
+        self._open_key = f'circuit:{name}:open'
+        # Set while the circuit has tripped and no trial has succeeded yet
+        self._tripped_key = f'circuit:{name}:tripped'
+        self._trial_key = f'circuit:{name}:trial'
+
+    def is_open(self):
+        """Return True while calls are being short-circuited."""
+        return cache.get(self._open_key) is not None
+
+    def call(self, func, *args, **kwargs):
+        """Call `func` through the breaker, recording its outcome."""
+        if self.is_open():
+            raise CircuitBreakerError(f"Circuit '{self.name}' is open")
+
+        trial = cache.get(self._tripped_key) is not None
+        # Only one caller gets the trial; the gate expires in case it dies mid-call
+        if trial and not cache.add(self._trial_key, True, timeout=self.reset_timeout):
+            raise CircuitBreakerError(f"Circuit '{self.name}' is waiting on a trial call")
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            if trial:
+                self._open()
+            else:
+                self._record_failure()
+            raise
+        finally:
+            if trial:
+                cache.delete(self._trial_key)
+
+        cache.delete_many([self._failures_key, self._tripped_key])
+        return result
+
+    def _record_failure(self):
+        # The window runs from the first failure; incr() keeps the expiry
+        cache.add(self._failures_key, 0, timeout=self.failure_window)
+        try:
+            failures = cache.incr(self._failures_key)
+        except ValueError:
+            # Expired or evicted between add() and incr()
+            cache.set(self._failures_key, 1, timeout=self.failure_window)
+            failures = 1
+
+        if failures >= self.fail_max:
+            self._open()
+            logger.warning("Circuit '%s' opened after %s failures", self.name, failures)
+
+    def _open(self):
+        cache.set(self._open_key, True, timeout=self.reset_timeout)
+        cache.set(self._tripped_key, True, timeout=None)
+        cache.delete(self._failures_key)
@@ -1,9 +1,36 @@
 import africastalking
 from django.conf import settings
+from functools import lru_cache
 import logging
+import re
+
+from .circuit import CircuitBreaker, CircuitBreakerError
 
 logger = logging.getLogger(__name__)
 
+# Shared across workers through the cache: stop calling Africa's Talking for a
+# while once it keeps erroring, instead of blocking every task on timeouts.
+provider_circuit = CircuitBreaker('africastalking', fail_max=5, reset_timeout=30)
+
+_NON_DIGIT = re.compile(r'\D')
+# Separators people usually type into phone numbers, stripped without a regex
+_PHONE_SEPARATORS = str.maketrans('', '', ' +-()./')
+
+# Order status update messages, formatted only for the status being sent
+STATUS_MESSAGE_TEMPLATES = {
+    'processing': "Your order {order_number} is now being processed.",
+    'shipped': "Great news! Your order {order_number} has been shipped and is on its way to you.",
+    'delivered': "Your order {order_number} has been delivered. Thank you for choosing us!",
+    'cancelled': "Your order {order_number} has been cancelled. If you have questions, please contact us."
+}
+DEFAULT_STATUS_MESSAGE_TEMPLATE = "Your order {order_number} status has been updated to {status}."
+
+
+def format_status_message(order_number, status):
+    """Return the SMS text announcing that an order moved to `status`."""
+    template = STATUS_MESSAGE_TEMPLATES.get(status, DEFAULT_STATUS_MESSAGE_TEMPLATE)
+    return template.format(order_number=order_number, status=status)
+
 
 class SMSService:
     """
@@ -36,7 +63,8 @@ class SMSService:
             phone_number = self._format_phone_number(phone_number)
             
             # Send SMS
-            response = self.sms.send(
+            response = provider_circuit.call(
+                self.sms.send,
                 message=message,
                 recipients=[phone_number],
                 sender_id=self.sender_id
@@ -46,17 +74,20 @@ class SMSService:
             if response['SMSMessageData']['Recipients']:
                 recipient = response['SMSMessageData']['Recipients'][0]
                 if 'Success' in recipient['status']:
-                    logger.info(f"SMS sent successfully to {phone_number}")
+                    logger.info("SMS sent successfully to %s", phone_number)
                     return True
                 else:
-                    logger.error(f"Failed to send SMS to {phone_number}: {recipient['status']}")
+                    logger.error("Failed to send SMS to %s: %s", phone_number, recipient['status'])
                     return False
             else:
-                logger.error(f"No recipients found in SMS response for {phone_number}")
+                logger.error("No recipients found in SMS response for %s", phone_number)
                 return False
                 
+        except CircuitBreakerError:
+            logger.warning("SMS provider unavailable, not sending to %s", phone_number)
+            return False
         except Exception as e:
-            logger.error(f"Error sending SMS to {phone_number}: {str(e)}")
+            logger.error("Error sending SMS to %s: %s", phone_number, e)
             return False
     
     def send_bulk_sms(self, recipients, message):
@@ -75,7 +106,8 @@ class SMSService:
             formatted_recipients = [self._format_phone_number(phone) for phone in recipients]
             
             # Send bulk SMS
-            response = self.sms.send(
+            response = provider_circuit.call(
+                self.sms.send,
                 message=message,
                 recipients=formatted_recipients,
                 sender_id=self.sender_id
@@ -101,11 +133,11 @@ class SMSService:
                         })
                         results['total_failed'] += 1
             
-            logger.info(f"Bulk SMS sent: {results['total_sent']} successful, {results['total_failed']} failed")
+            logger.info("Bulk SMS sent: %s successful, %s failed", results['total_sent'], results['total_failed'])
             return results
             
         except Exception as e:
-            logger.error(f"Error sending bulk SMS: {str(e)}")
+            logger.error("Error sending bulk SMS: %s", e)
             return {
                 'successful': [],
                 'failed': recipients,
@@ -124,20 +156,21 @@ class SMSService:
         Returns:
             str: Formatted phone number
         """
+        # Already-formatted Kenyan numbers are by far the common case
+        if phone_number.startswith('+254') and phone_number[1:].isdecimal():
+            return phone_number
+        
         # Remove any spaces, hyphens, or other non-digit characters
-        cleaned = ''.join(filter(str.isdigit, phone_number))
+        cleaned = phone_number.translate(_PHONE_SEPARATORS)
+        if not cleaned.isdecimal():
+            cleaned = _NON_DIGIT.sub('', cleaned)
         
         # If number starts with 0, assume it's a local Kenyan number
         if cleaned.startswith('0'):
             cleaned = '254' + cleaned[1:]  # Replace 0 with Kenya country code
         
         # Ensure it starts with +
-        if not phone_number.startswith('+'):
-            cleaned = '+' + cleaned
-        else:
-            cleaned = phone_number
-        
-        return cleaned
+        return '+' + cleaned
     
     def get_delivery_reports(self, message_id):
         """
@@ -154,35 +187,33 @@ class SMSService:
             # Process delivery reports
             return response
         except Exception as e:
-            logger.error(f"Error fetching delivery reports: {str(e)}")
+            logger.error("Error fetching delivery reports: %s", e)
             return None
 
 
+@lru_cache(maxsize=1)
+def get_sms_service():
+    """Return the process-wide SMS service, initializing the SDK on first use."""
+    return SMSService()
+
+
 # Utility functions for common SMS operations
 def send_welcome_sms(customer):
     """Send welcome SMS to new customer."""
-    sms_service = SMSService()
+    sms_service = get_sms_service()
     message = f"Welcome to our service, {customer.name}! Your customer code is {customer.code}. Thank you for joining us!"
     return sms_service.send_sms(customer.phone_number, message)
 
 
 def send_order_confirmation_sms(order):
     """Send order confirmation SMS."""
-    sms_service = SMSService()
+    sms_service = get_sms_service()
     message = f"Hello {order.customer.name}! Your order {order.order_number} for {order.item} (Amount: ${order.total_amount}) has been confirmed. Thank you!"
     return sms_service.send_sms(order.customer.phone_number, message)
 
 
 def send_order_status_update_sms(order, old_status, new_status):
     """Send order status update SMS."""
-    sms_service = SMSService()
-    
-    status_messages = {
-        'processing': f"Your order {order.order_number} is now being processed.",
-        'shipped': f"Great news! Your order {order.order_number} has been shipped and is on its way to you.",
-        'delivered': f"Your order {order.order_number} has been delivered. Thank you for choosing us!",
-        'cancelled': f"Your order {order.order_number} has been cancelled. If you have questions, please contact us."
-    }
-    
-    message = status_messages.get(new_status, f"Your order {order.order_number} status has been updated to {new_status}.")
+    sms_service = get_sms_service()
+    message = format_status_message(order.order_number, new_status)
     return sms_service.send_sms(order.customer.phone_number, message)
@@ -0,0 +1,64 @@
+from django.test import SimpleTestCase
+from django.core.cache import cache
+from unittest.mock import patch
+from notifications.circuit import CircuitBreaker, CircuitBreakerError
+import time
+
+
+def fail():
+    raise RuntimeError('provider down')
+
+
+class CircuitBreakerTest(SimpleTestCase):
+    """Test cases for the circuit breaker."""
+    
+    def setUp(self):
+        cache.clear()
+        self.breaker = CircuitBreaker('test', fail_max=2, reset_timeout=30, failure_window=60)
+    
+    def trip(self):
+        for _ in range(self.breaker.fail_max):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(fail)
+    
+    def test_opens_after_fail_max_failures(self):
+        """Test that the circuit refuses calls once it trips."""
+        self.trip()
+        
+        self.assertTrue(self.breaker.is_open())
+        with self.assertRaises(CircuitBreakerError):
+            self.breaker.call(lambda: 'ok')
+    
+    def test_failures_expire_after_window(self):
+        """Test that failures older than the window don't trip the circuit."""
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(fail)
+        
+        with patch('time.time', return_value=time.time() + 61):
+            with self.assertRaises(RuntimeError):
+                self.breaker.call(fail)
+            self.assertFalse(self.breaker.is_open())
+    
+    def test_single_trial_call_after_reset_timeout(self):
+        """Test that only one caller is let through once the circuit half-opens."""
+        self.trip()
+        cache.delete(self.breaker._open_key)  # reset_timeout elapsed
+        
+        def trial():
+            # A concurrent caller during the trial still fails fast
+            with self.assertRaises(CircuitBreakerError):
+                self.breaker.call(lambda: 'ok')
+            return 'ok'
+        
+        self.assertEqual(self.breaker.call(trial), 'ok')
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+    
+    def test_failed_trial_reopens_circuit(self):
+        """Test that a failing trial call opens the circuit again."""
+        self.trip()
+        cache.delete(self.breaker._open_key)  # reset_timeout elapsed
+        
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(fail)
+        
+        self.assertTrue(self.breaker.is_open())
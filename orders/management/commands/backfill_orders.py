@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, OuterRef, Subquery
+
+from customers.models import Customer
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    """
+    Fill in the derived order columns for rows written before they existed,
+    or by QuerySet.update() calls that bypassed Order.save().
+
+    Safe to run repeatedly; rows that are already correct are left alone.
+    """
+    help = "Recompute stored order totals and customer names"
+
+    def handle(self, *args, **options):
+        total = F('amount') * F('quantity')
+        updated = Order.objects.exclude(total_amount=total).update(total_amount=total)
+        self.stdout.write(f"Updated total_amount on {updated} orders")
+
+        name = Subquery(Customer.objects.filter(pk=OuterRef('customer_id')).values('name')[:1])
+        updated = Order.objects.exclude(customer_name=name).update(customer_name=name)
+        self.stdout.write(f"Updated customer_name on {updated} orders")
@@ -1,8 +1,35 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from decimal import Decimal
+import secrets
 import uuid
 
+from savannah_microservice.unique_fields import assign_unique_values, save_with_unique_retry
+
+# Attempts at drawing a free order number before giving up on save
+ORDER_NUMBER_ATTEMPTS = 3
+
+
+class OrderQuerySet(models.QuerySet):
+    """
+    QuerySet with helpers for creating orders in bulk.
+    """
+
+    def bulk_create_orders(self, data_list, batch_size=1000):
+        """Create orders from a list of field dicts with batched INSERTs."""
+        orders = [self.model(**data) for data in data_list]
+        for order in orders:
+            order.total_amount = order.amount * order.quantity
+            order.customer_name = order.customer.name
+
+        # bulk_create() skips save() (and its signals), so the derived columns
+        # are set above and order numbers are drawn here
+        assign_unique_values(self, orders, 'order_number', Order.generate_order_number)
+
+        with transaction.atomic():
+            return self.bulk_create(orders, batch_size=batch_size)
+
 
 class Order(models.Model):
     """
@@ -23,6 +50,14 @@ class Order(models.Model):
         related_name='orders',
         help_text="Customer who placed the order"
     )
+    # Copied from the customer so order lists don't need the join; rows from
+    # before the column existed are filled in by the backfill_orders command
+    customer_name = models.CharField(
+        max_length=255,
+        default='',
+        editable=False,
+        help_text="Customer name, kept in sync with the customer"
+    )
     item = models.CharField(
         max_length=255,
         help_text="Description of the ordered item"
@@ -50,6 +85,16 @@ class Order(models.Model):
         default=1,
         help_text="Quantity of items ordered"
     )
+    # Maintained by save() and bulk_create_orders(); QuerySet.update() of
+    # amount or quantity bypasses both, so run the backfill_orders command
+    # afterwards. The default only fills existing rows when the column is added.
+    total_amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        editable=False,
+        help_text="Amount multiplied by quantity, kept in sync on save"
+    )
     notes = models.TextField(
         blank=True,
         help_text="Additional notes for the order"
@@ -76,44 +121,57 @@ class Order(models.Model):
         help_text="When SMS notification was sent"
     )
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         db_table = 'orders'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['customer', 'created_at']),
-            models.Index(fields=['status']),
-            models.Index(fields=['order_number']),
+            # Status filters, newest first; also covers status-only lookups
+            models.Index(fields=['status', 'created_at']),
             models.Index(fields=['created_at']),
+            # Open orders, newest first: small enough to stay cached and
+            # already in the default list ordering
+            models.Index(
+                fields=['-created_at'],
+                name='orders_active_idx',
+                condition=models.Q(status__in=['pending', 'processing'])
+            ),
         ]
 
     def __str__(self):
         return f"Order {self.order_number} - {self.customer.name}"
 
     def save(self, *args, **kwargs):
+        # Keep the stored total and customer name in step with their sources
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.total_amount = self.amount * self.quantity
+            self.customer_name = self.customer.name
+        else:
+            update_fields = set(update_fields)
+            if {'amount', 'quantity'} & update_fields:
+                self.total_amount = self.amount * self.quantity
+                update_fields.add('total_amount')
+            if 'customer' in update_fields:
+                self.customer_name = self.customer.name
+                update_fields.add('customer_name')
+            kwargs['update_fields'] = update_fields
+
+        if self.order_number:
+            super().save(*args, **kwargs)
+            return
+
         # Auto-generate order number if not provided
-        if not self.order_number:
-            self.order_number = self.generate_order_number()
-        super().save(*args, **kwargs)
+        save_with_unique_retry(
+            self, 'order_number', Order.generate_order_number, ORDER_NUMBER_ATTEMPTS,
+            lambda: super(Order, self).save(*args, **kwargs)
+        )
 
     def generate_order_number(self):
-        """Generate a unique order number."""
-        import random
-        import string
-        from django.utils import timezone
-        
-        # Use current date + random digits
-        date_part = timezone.now().strftime('%Y%m%d')
-        
-        while True:
-            random_part = ''.join(random.choices(string.digits, k=4))
-            order_number = f"ORD{date_part}{random_part}"
-            if not Order.objects.filter(order_number=order_number).exists():
-                return order_number
-
-    @property
-    def total_amount(self):
-        """Calculate total amount (amount * quantity)."""
-        return self.amount * self.quantity
+        """Generate a candidate order number: current date + random digits."""
+        return f"ORD{timezone.now():%Y%m%d}{secrets.randbelow(10 ** 9):09d}"
 
     def can_be_cancelled(self):
         """Check if order can be cancelled."""
@@ -123,6 +181,6 @@ class Order(models.Model):
         """Mark order as delivered."""
         if self.status == 'shipped':
             self.status = 'delivered'
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             return True
         return False
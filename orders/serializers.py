@@ -1,13 +1,27 @@
 from rest_framework import serializers
+from django.db import transaction
 from .models import Order
-from customers.serializers import CustomerListSerializer
+from .tasks import send_order_sms_notification
+from customers.models import Customer
+from customers.serializers import customer_summary
+
+# Statuses an order may move to from each status
+VALID_STATUS_TRANSITIONS = {
+    'pending': frozenset({'processing', 'cancelled'}),
+    'processing': frozenset({'shipped', 'cancelled'}),
+    'shipped': frozenset({'delivered'}),
+    'delivered': frozenset(),  # Cannot change from delivered
+    'cancelled': frozenset(),  # Cannot change from cancelled
+}
 
 
 class OrderSerializer(serializers.ModelSerializer):
     """
     Serializer for Order model with customer details.
     """
-    customer_details = CustomerListSerializer(source='customer', read_only=True)
+    # Built directly from the related customer rather than through a nested
+    # serializer; same fields as CustomerListSerializer
+    customer_details = serializers.SerializerMethodField()
     total_amount = serializers.ReadOnlyField()
     can_be_cancelled = serializers.ReadOnlyField()
 
@@ -23,6 +37,10 @@ class OrderSerializer(serializers.ModelSerializer):
             'sms_sent', 'sms_sent_at'
         ]
 
+    def get_customer_details(self, obj):
+        """Return the customer summary for this order."""
+        return customer_summary(obj.customer)
+
     def validate_amount(self, value):
         """Validate that amount is positive."""
         if value <= 0:
@@ -39,15 +57,7 @@ class OrderSerializer(serializers.ModelSerializer):
         """Validate status transitions."""
         if self.instance:
             old_status = self.instance.status
-            valid_transitions = {
-                'pending': ['processing', 'cancelled'],
-                'processing': ['shipped', 'cancelled'],
-                'shipped': ['delivered'],
-                'delivered': [],  # Cannot change from delivered
-                'cancelled': []   # Cannot change from cancelled
-            }
-            
-            if value != old_status and value not in valid_transitions.get(old_status, []):
+            if value != old_status and value not in VALID_STATUS_TRANSITIONS.get(old_status, ()):
                 raise serializers.ValidationError(
                     f"Cannot change status from {old_status} to {value}."
                 )
@@ -58,6 +68,12 @@ class OrderCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating a new order.
     """
+    # Only the customer's name is read after creation (for logging); the SMS
+    # task reloads what it needs, so don't fetch the whole customer row here.
+    customer = serializers.PrimaryKeyRelatedField(
+        queryset=Customer.objects.only('id', 'name')
+    )
+
     class Meta:
         model = Order
         fields = ['customer', 'item', 'amount', 'quantity', 'notes']
@@ -78,9 +94,8 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         """Create order and trigger SMS notification."""
         order = Order.objects.create(**validated_data)
         
-        # Trigger SMS notification asynchronously
-        from .tasks import send_order_sms_notification
-        send_order_sms_notification.delay(order.id)
+        # Trigger SMS notification asynchronously, once the order is committed
+        transaction.on_commit(lambda: send_order_sms_notification.delay(order.id))
         
         return order
 
@@ -89,7 +104,6 @@ class OrderListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for order list views.
     """
-    customer_name = serializers.CharField(source='customer.name', read_only=True)
     total_amount = serializers.ReadOnlyField()
 
     class Meta:
@@ -112,16 +126,14 @@ class OrderStatusUpdateSerializer(serializers.ModelSerializer):
         """Validate status transitions."""
         if self.instance:
             old_status = self.instance.status
-            valid_transitions = {
-                'pending': ['processing', 'cancelled'],
-                'processing': ['shipped', 'cancelled'],
-                'shipped': ['delivered'],
-                'delivered': [],  # Cannot change from delivered
-                'cancelled': []   # Cannot change from cancelled
-            }
-            
-            if value != old_status and value not in valid_transitions.get(old_status, []):
+            if value != old_status and value not in VALID_STATUS_TRANSITIONS.get(old_status, ()):
                 raise serializers.ValidationError(
                     f"Cannot change status from {old_status} to {value}."
                 )
         return value
+
+    def update(self, instance, validated_data):
+        """Write only the status columns rather than the whole row."""
+        instance.status = validated_data.get('status', instance.status)
+        instance.save(update_fields=['status', 'updated_at'])
+        return instance
@@ -3,92 +3,121 @@ from django.utils import timezone
 from django.conf import settings
 import logging
 
+from notifications.sms import format_status_message, get_sms_service
+from .models import Order
+
 logger = logging.getLogger(__name__)
 
 
-@shared_task
-def send_order_sms_notification(order_id):
+class SMSDeliveryError(Exception):
+    """Raised when the SMS provider did not accept a message, so the task is retried."""
+
+
+# SMS tasks are only acknowledged once they finish, and a rejected send is
+# retried with exponential backoff (capped at 5 minutes) instead of dropped.
+SMS_TASK_OPTIONS = {
+    'bind': True,
+    'acks_late': True,
+    'autoretry_for': (SMSDeliveryError,),
+    'retry_backoff': True,
+    'retry_backoff_max': 300,
+    'retry_jitter': True,
+    'max_retries': 5,
+}
+
+
+@shared_task(**SMS_TASK_OPTIONS)
+def send_order_sms_notification(self, order_id):
     """
     Send SMS notification to customer when an order is created.
     """
     try:
-        from .models import Order
-        from notifications.sms import SMSService
+        # The name is denormalized onto the order; only the phone number
+        # still comes from the customer
+        order = Order.objects.select_related('customer').only(
+            'id', 'order_number', 'item', 'total_amount', 'customer_name',
+            'customer__phone_number'
+        ).get(id=order_id)
         
-        order = Order.objects.get(id=order_id)
+        # Claim the send with a conditional UPDATE, so a redelivered or
+        # retried task doesn't text the customer a second time
+        claimed = Order.objects.filter(id=order.id, sms_sent=False).update(
+            sms_sent=True, sms_sent_at=timezone.now()
+        )
+        if not claimed:
+            logger.info("SMS already sent for order %s", order.order_number)
+            return True
         
         # Prepare SMS message
-        message = f"Hello {order.customer.name}! Your order {order.order_number} for {order.item} (Amount: ${order.total_amount}) has been received. Thank you for your business!"
+        message = f"Hello {order.customer_name}! Your order {order.order_number} for {order.item} (Amount: ${order.total_amount}) has been received. Thank you for your business!"
         
-        # Send SMS
-        sms_service = SMSService()
-        success = sms_service.send_sms(
-            phone_number=order.customer.phone_number,
-            message=message
-        )
+        # Send SMS, releasing the claim if it doesn't go out so a retry can
+        success = False
+        try:
+            sms_service = get_sms_service()
+            success = sms_service.send_sms(
+                phone_number=order.customer.phone_number,
+                message=message
+            )
+        finally:
+            if not success:
+                Order.objects.filter(id=order.id).update(sms_sent=False, sms_sent_at=None)
         
         if success:
-            # Mark SMS as sent
-            order.sms_sent = True
-            order.sms_sent_at = timezone.now()
-            order.save()
-            
-            logger.info(f"SMS sent successfully for order {order.order_number}")
+            logger.info("SMS sent successfully for order %s", order.order_number)
         else:
-            logger.error(f"Failed to send SMS for order {order.order_number}")
+            logger.error("Failed to send SMS for order %s", order.order_number)
+            raise SMSDeliveryError(f"SMS for order {order.order_number} was not sent")
             
         return success
         
     except Order.DoesNotExist:
-        logger.error(f"Order with id {order_id} not found")
+        logger.error("Order with id %s not found", order_id)
         return False
+    except SMSDeliveryError:
+        raise
     except Exception as e:
-        logger.error(f"Error sending SMS for order {order_id}: {str(e)}")
+        logger.error("Error sending SMS for order %s: %s", order_id, e)
         return False
 
 
-@shared_task
-def send_order_status_update_sms(order_id, old_status, new_status):
+@shared_task(**SMS_TASK_OPTIONS)
+def send_order_status_update_sms(self, order_id, old_status, new_status):
     """
     Send SMS notification when order status changes.
     """
     try:
-        from .models import Order
-        from notifications.sms import SMSService
-        
-        order = Order.objects.get(id=order_id)
+        order = Order.objects.select_related('customer').only(
+            'id', 'order_number', 'customer__phone_number'
+        ).get(id=order_id)
         
         # Only send SMS for important status changes
         important_statuses = ['shipped', 'delivered', 'cancelled']
         if new_status not in important_statuses:
             return True
         
-        # Prepare status-specific message
-        status_messages = {
-            'shipped': f"Good news! Your order {order.order_number} has been shipped and is on its way to you.",
-            'delivered': f"Your order {order.order_number} has been delivered. Thank you for choosing us!",
-            'cancelled': f"Your order {order.order_number} has been cancelled. If you have questions, please contact us."
-        }
-        
-        message = status_messages.get(new_status, f"Your order {order.order_number} status has been updated to {new_status}.")
+        message = format_status_message(order.order_number, new_status)
         
         # Send SMS
-        sms_service = SMSService()
+        sms_service = get_sms_service()
         success = sms_service.send_sms(
             phone_number=order.customer.phone_number,
             message=message
         )
         
         if success:
-            logger.info(f"Status update SMS sent for order {order.order_number}: {old_status} -> {new_status}")
+            logger.info("Status update SMS sent for order %s: %s -> %s", order.order_number, old_status, new_status)
         else:
-            logger.error(f"Failed to send status update SMS for order {order.order_number}")
+            logger.error("Failed to send status update SMS for order %s", order.order_number)
+            raise SMSDeliveryError(f"Status update SMS for order {order.order_number} was not sent")
             
         return success
         
     except Order.DoesNotExist:
-        logger.error(f"Order with id {order_id} not found")
+        logger.error("Order with id %s not found", order_id)
         return False
+    except SMSDeliveryError:
+        raise
     except Exception as e:
-        logger.error(f"Error sending status update SMS for order {order_id}: {str(e)}")
+        logger.error("Error sending status update SMS for order %s: %s", order_id, e)
         return False
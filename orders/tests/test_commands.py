@@ -0,0 +1,49 @@
+from django.test import TestCase
+from django.core.management import call_command
+from decimal import Decimal
+from io import StringIO
+from customers.models import Customer
+from orders.models import Order
+
+
+class BackfillOrdersCommandTest(TestCase):
+    """Test cases for the backfill_orders management command."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+    
+    def test_backfills_total_amount(self):
+        """Test stale totals are recomputed from amount and quantity."""
+        order = Order.objects.create(
+            customer=self.customer,
+            item='Test Product',
+            amount=Decimal('25.00'),
+            quantity=4
+        )
+        # QuerySet.update() skips save(), leaving the stored total stale
+        Order.objects.filter(pk=order.pk).update(amount=Decimal('30.00'))
+        
+        call_command('backfill_orders', stdout=StringIO())
+        order.refresh_from_db()
+        
+        self.assertEqual(order.total_amount, Decimal('120.00'))
+    
+    def test_backfills_customer_name(self):
+        """Test orders missing the copied customer name get it from the customer."""
+        order = Order.objects.create(
+            customer=self.customer,
+            item='Test Product',
+            amount=Decimal('25.00')
+        )
+        # Rows written before the column existed hold the default
+        Order.objects.filter(pk=order.pk).update(customer_name='')
+        
+        call_command('backfill_orders', stdout=StringIO())
+        order.refresh_from_db()
+        
+        self.assertEqual(order.customer_name, 'John Doe')
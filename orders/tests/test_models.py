@@ -1,4 +1,5 @@
 from django.test import TestCase
+from unittest.mock import patch
 from decimal import Decimal
 from customers.models import Customer
 from orders.models import Order
@@ -7,8 +8,9 @@ from orders.models import Order
 class OrderModelTest(TestCase):
     """Test cases for Order model."""
     
-    def setUp(self):
-        self.customer = Customer.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(
             name='John Doe',
             email='john@example.com',
             phone_number='+254700123456'
@@ -41,8 +43,8 @@ class OrderModelTest(TestCase):
         
         self.assertIsNotNone(order.order_number)
         self.assertTrue(order.order_number.startswith('ORD'))
-        # Should have format: ORD + YYYYMMDD + 4 digits
-        self.assertEqual(len(order.order_number), 15)
+        # Should have format: ORD + YYYYMMDD + 9 digits
+        self.assertEqual(len(order.order_number), 20)
     
     def test_order_number_uniqueness(self):
         """Test that order numbers are unique."""
@@ -60,6 +62,39 @@ class OrderModelTest(TestCase):
         
         self.assertNotEqual(order1.order_number, order2.order_number)
     
+    def test_order_number_collision_retries(self):
+        """Test that a colliding generated order number is replaced on save."""
+        existing = Order.objects.create(
+            customer=self.customer,
+            item='Product 1',
+            amount=Decimal('50.00')
+        )
+        
+        with patch.object(
+            Order, 'generate_order_number',
+            side_effect=[existing.order_number, 'ORD20240101000000001']
+        ):
+            order = Order.objects.create(
+                customer=self.customer,
+                item='Product 2',
+                amount=Decimal('75.00')
+            )
+        
+        self.assertEqual(order.order_number, 'ORD20240101000000001')
+    
+    def test_bulk_create_orders(self):
+        """Test bulk order creation assigns unique order numbers."""
+        orders = Order.objects.bulk_create_orders([
+            {'customer': self.customer, 'item': 'Product 1', 'amount': Decimal('50.00')},
+            {'customer': self.customer, 'item': 'Product 2', 'amount': Decimal('75.00'), 'quantity': 3},
+        ])
+        
+        self.assertEqual(len(orders), 2)
+        self.assertEqual(Order.objects.count(), 2)
+        order_numbers = set(Order.objects.values_list('order_number', flat=True))
+        self.assertEqual(len(order_numbers), 2)
+        self.assertTrue(all(number.startswith('ORD') for number in order_numbers))
+    
     def test_total_amount_property(self):
         """Test total_amount property calculation."""
         order = Order.objects.create(
@@ -72,6 +107,54 @@ class OrderModelTest(TestCase):
         expected_total = Decimal('25.00') * 3
         self.assertEqual(order.total_amount, expected_total)
     
+    def test_total_amount_follows_quantity_update(self):
+        """Test stored total_amount is refreshed when quantity changes."""
+        order = Order.objects.create(
+            customer=self.customer,
+            item='Test Product',
+            amount=Decimal('25.00'),
+            quantity=3
+        )
+        
+        order.quantity = 4
+        order.save(update_fields=['quantity'])
+        order.refresh_from_db()
+        
+        self.assertEqual(order.total_amount, Decimal('100.00'))
+    
+    def test_customer_name_follows_customer_rename(self):
+        """Test stored customer_name is copied on save and refreshed on rename."""
+        order = Order.objects.create(
+            customer=self.customer,
+            item='Test Product',
+            amount=Decimal('25.00')
+        )
+        self.assertEqual(order.customer_name, self.customer.name)
+        
+        self.customer.name = 'Jane Doe'
+        self.customer.save()
+        order.refresh_from_db()
+        
+        self.assertEqual(order.customer_name, 'Jane Doe')
+    
+    def test_customer_save_without_rename_skips_order_sync(self):
+        """Test saving a customer whose name didn't change leaves orders alone."""
+        Order.objects.create(
+            customer=self.customer,
+            item='Test Product',
+            amount=Decimal('25.00')
+        )
+        customer = Customer.objects.get(pk=self.customer.pk)
+        
+        customer.phone_number = '+254700999999'
+        # Only the customer UPDATE
+        with self.assertNumQueries(1):
+            customer.save()
+        
+        customer.name = 'Jane Doe'
+        with self.assertNumQueries(1):
+            customer.save(update_fields=['phone_number'])
+    
     def test_can_be_cancelled_method(self):
         """Test can_be_cancelled method."""
         order = Order.objects.create(
@@ -13,13 +13,22 @@ from orders.serializers import (
 class OrderSerializerTest(TestCase):
     """Test cases for Order serializers."""
     
-    def setUp(self):
-        self.customer = Customer.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(
             name='John Doe',
             email='john@example.com',
             phone_number='+254700123456'
         )
         
+        cls.order = Order.objects.create(
+            customer=cls.customer,
+            item='Test Product',
+            amount=Decimal('99.99'),
+            quantity=2
+        )
+    
+    def setUp(self):
         self.order_data = {
             'customer': self.customer.id,
             'item': 'Test Product',
@@ -27,13 +36,6 @@ class OrderSerializerTest(TestCase):
             'quantity': 2,
             'notes': 'Test notes'
         }
-        
-        self.order = Order.objects.create(
-            customer=self.customer,
-            item='Test Product',
-            amount=Decimal('99.99'),
-            quantity=2
-        )
     
     def test_order_serializer_data(self):
         """Test OrderSerializer serialization."""
@@ -0,0 +1,85 @@
+from django.test import TestCase
+from unittest.mock import patch
+from decimal import Decimal
+from customers.models import Customer
+from orders.models import Order
+from orders.tasks import (
+    SMSDeliveryError,
+    send_order_sms_notification,
+    send_order_status_update_sms
+)
+
+
+class OrderTaskTest(TestCase):
+    """Test cases for order Celery tasks."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456'
+        )
+    
+    def setUp(self):
+        self.order = Order.objects.create(
+            customer=self.customer,
+            item='Test Product',
+            amount=Decimal('99.99'),
+            quantity=2
+        )
+    
+    @patch('notifications.sms.SMSService.send_sms')
+    def test_send_order_sms_notification(self, mock_send_sms):
+        """Test order SMS is sent and recorded."""
+        mock_send_sms.return_value = True
+        
+        # Order with customer, then the sms_sent claim
+        with self.assertNumQueries(2):
+            result = send_order_sms_notification(self.order.id)
+        
+        self.assertTrue(result)
+        message = mock_send_sms.call_args[1]['message']
+        self.assertIn(self.customer.name, message)
+        self.assertIn(self.order.order_number, message)
+        self.assertIn(str(self.order.total_amount), message)
+        self.order.refresh_from_db()
+        self.assertTrue(self.order.sms_sent)
+        self.assertIsNotNone(self.order.sms_sent_at)
+    
+    @patch('notifications.sms.SMSService.send_sms')
+    def test_send_order_sms_notification_failure(self, mock_send_sms):
+        """Test failed order SMS is raised for retry and not recorded as sent."""
+        mock_send_sms.return_value = False
+        
+        with self.assertRaises(SMSDeliveryError):
+            send_order_sms_notification(self.order.id)
+        
+        self.order.refresh_from_db()
+        self.assertFalse(self.order.sms_sent)
+        self.assertIsNone(self.order.sms_sent_at)
+    
+    @patch('notifications.sms.SMSService.send_sms')
+    def test_send_order_sms_notification_already_sent(self, mock_send_sms):
+        """Test a redelivered task does not send the order SMS twice."""
+        mock_send_sms.return_value = True
+        
+        self.assertTrue(send_order_sms_notification(self.order.id))
+        self.assertTrue(send_order_sms_notification(self.order.id))
+        
+        mock_send_sms.assert_called_once()
+    
+    @patch('notifications.sms.SMSService.send_sms')
+    def test_send_order_status_update_sms(self, mock_send_sms):
+        """Test status update SMS is sent for important statuses."""
+        mock_send_sms.return_value = True
+        
+        with self.assertNumQueries(1):
+            result = send_order_status_update_sms(self.order.id, 'processing', 'shipped')
+        
+        self.assertTrue(result)
+        self.assertEqual(mock_send_sms.call_args[1]['phone_number'], self.customer.phone_number)
+        self.assertEqual(
+            mock_send_sms.call_args[1]['message'],
+            f"Great news! Your order {self.order.order_number} has been shipped and is on its way to you."
+        )
@@ -1,4 +1,5 @@
-from django.urls import reverse
+from django.urls import reverse, reverse_lazy
+from functools import lru_cache
 from rest_framework import status
 from decimal import Decimal
 from customers.models import Customer
@@ -6,18 +7,32 @@ from orders.models import Order
 from tests.conftest import AuthenticatedAPITestCase
 from unittest.mock import patch
 
+ORDER_LIST_URL = reverse_lazy('order-list')
+ORDER_ANALYTICS_URL = reverse_lazy('order-analytics')
+ORDER_SEARCH_URL = reverse_lazy('order-search')
+ORDER_BY_CUSTOMER_URL = reverse_lazy('order-by-customer')
+
+
+@lru_cache(maxsize=None)
+def detail_url(pk, action='detail'):
+    """URL of an order detail route, e.g. detail_url(pk, 'cancel')."""
+    return reverse(f'order-{action}', kwargs={'pk': pk})
+
 
 class OrderViewSetTest(AuthenticatedAPITestCase):
     """Test cases for Order ViewSet."""
     
-    def setUp(self):
-        super().setUp()
-        self.customer = Customer.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.customer = Customer.objects.create(
             name='John Doe',
             email='john@example.com',
             phone_number='+254700123456'
         )
-        
+    
+    def setUp(self):
+        super().setUp()
         self.order_data = {
             'customer': str(self.customer.id),
             'item': 'Test Product',
@@ -29,8 +44,8 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
     @patch('orders.tasks.send_order_sms_notification.delay')
     def test_create_order(self, mock_sms_task):
         """Test creating an order."""
-        url = reverse('order-list')
-        response = self.client.post(url, self.order_data, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(ORDER_LIST_URL, self.order_data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Order.objects.count(), 1)
@@ -47,22 +62,22 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
     def test_list_orders(self):
         """Test listing orders."""
         # Create test orders
-        Order.objects.create(
-            customer=self.customer,
-            item='Product 1',
-            amount=Decimal('50.00')
-        )
-        Order.objects.create(
-            customer=self.customer,
-            item='Product 2',
-            amount=Decimal('75.00')
-        )
+        Order.objects.bulk_create_orders([
+            {'customer': self.customer, 'item': 'Product 1', 'amount': Decimal('50.00')},
+            {'customer': self.customer, 'item': 'Product 2', 'amount': Decimal('75.00')},
+        ])
         
-        url = reverse('order-list')
-        response = self.client.get(url)
+        # Token lookup, page count, and one page query without the customer join
+        with self.assertNumQueries(3):
+            response = self.client.get(ORDER_LIST_URL)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(
+            {order['total_amount'] for order in response.data['results']},
+            {Decimal('50.00'), Decimal('75.00')}
+        )
+        self.assertEqual(response.data['results'][0]['customer_name'], self.customer.name)
     
     def test_retrieve_order(self):
         """Test retrieving a specific order."""
@@ -72,13 +87,28 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
             amount=Decimal('50.00')
         )
         
-        url = reverse('order-detail', kwargs={'pk': order.pk})
-        response = self.client.get(url)
+        response = self.client.get(detail_url(order.pk))
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['item'], 'Test Product')
         self.assertIn('customer_details', response.data)
     
+    def test_retrieve_order_customer_details_datetime_format(self):
+        """Test customer_details datetimes are formatted like the customer endpoint's."""
+        order = Order.objects.create(
+            customer=self.customer,
+            item='Test Product',
+            amount=Decimal('50.00')
+        )
+        
+        response = self.client.get(detail_url(order.pk))
+        customer_response = self.client.get(reverse('customer-detail', kwargs={'pk': self.customer.pk}))
+        
+        self.assertEqual(
+            response.json()['customer_details']['created_at'],
+            customer_response.json()['created_at']
+        )
+    
     def test_update_order(self):
         """Test updating an order."""
         order = Order.objects.create(
@@ -87,9 +117,8 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
             amount=Decimal('50.00')
         )
         
-        url = reverse('order-detail', kwargs={'pk': order.pk})
         data = {'item': 'Updated Product'}
-        response = self.client.patch(url, data, format='json')
+        response = self.client.patch(detail_url(order.pk), data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         order.refresh_from_db()
@@ -104,11 +133,14 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
             status='pending'
         )
         
-        url = reverse('order-update-status', kwargs={'pk': order.pk})
         data = {'status': 'processing'}
-        response = self.client.patch(url, data, format='json')
+        # Token lookup, the order with its customer, and the status UPDATE
+        with self.assertNumQueries(3):
+            response = self.client.patch(detail_url(order.pk, 'update-status'), data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'processing')
+        self.assertEqual(response.data['customer_details']['name'], self.customer.name)
         order.refresh_from_db()
         self.assertEqual(order.status, 'processing')
     
@@ -121,9 +153,8 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
             status='delivered'
         )
         
-        url = reverse('order-update-status', kwargs={'pk': order.pk})
         data = {'status': 'pending'}  # Can't go back from delivered
-        response = self.client.patch(url, data, format='json')
+        response = self.client.patch(detail_url(order.pk, 'update-status'), data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
     
@@ -136,10 +167,11 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
             status='pending'
         )
         
-        url = reverse('order-cancel', kwargs={'pk': order.pk})
-        response = self.client.post(url)
+        with self.assertNumQueries(3):
+            response = self.client.post(detail_url(order.pk, 'cancel'))
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['order']['status'], 'cancelled')
         order.refresh_from_db()
         self.assertEqual(order.status, 'cancelled')
     
@@ -152,8 +184,7 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
             status='delivered'
         )
         
-        url = reverse('order-cancel', kwargs={'pk': order.pk})
-        response = self.client.post(url)
+        response = self.client.post(detail_url(order.pk, 'cancel'))
         
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         order.refresh_from_db()
@@ -165,33 +196,30 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
         order = Order.objects.create(
             customer=self.customer,
             item='Test Product',
-            amount=Decimal('50.00')
+            amount=Decimal('50.00'),
+            sms_sent=True
         )
         
-        url = reverse('order-resend-sms', kwargs={'pk': order.pk})
-        response = self.client.post(url)
+        # Token lookup, the narrowed order fetch, and the sms_sent reset
+        with self.assertNumQueries(3):
+            response = self.client.post(detail_url(order.pk, 'resend-sms'))
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         mock_sms_task.assert_called_once_with(order.id)
+        order.refresh_from_db()
+        self.assertFalse(order.sms_sent)
     
     def test_order_analytics(self):
         """Test order analytics endpoint."""
         # Create test orders
-        Order.objects.create(
-            customer=self.customer,
-            item='Product 1',
-            amount=Decimal('50.00'),
-            status='pending'
-        )
-        Order.objects.create(
-            customer=self.customer,
-            item='Product 2',
-            amount=Decimal('75.00'),
-            status='delivered'
-        )
+        Order.objects.bulk_create_orders([
+            {'customer': self.customer, 'item': 'Product 1', 'amount': Decimal('50.00'), 'status': 'pending'},
+            {'customer': self.customer, 'item': 'Product 2', 'amount': Decimal('75.00'), 'status': 'delivered'},
+        ])
         
-        url = reverse('order-analytics')
-        response = self.client.get(url)
+        # Token lookup and one aggregate for the summary and status counts
+        with self.assertNumQueries(2):
+            response = self.client.get(ORDER_ANALYTICS_URL)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('summary', response.data)
@@ -200,22 +228,23 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
         summary = response.data['summary']
         self.assertEqual(summary['total_orders'], 2)
         self.assertEqual(float(summary['total_revenue']), 125.00)
+        self.assertEqual(summary['recent_orders_7_days'], 2)
+        
+        by_status = response.data['orders_by_status']
+        self.assertEqual(by_status['pending'], 1)
+        self.assertEqual(by_status['delivered'], 1)
+        self.assertEqual(by_status['cancelled'], 0)
     
     def test_search_orders(self):
         """Test order search functionality."""
-        Order.objects.create(
-            customer=self.customer,
-            item='Laptop Computer',
-            amount=Decimal('999.99')
-        )
-        Order.objects.create(
-            customer=self.customer,
-            item='Mouse Pad',
-            amount=Decimal('15.99')
-        )
+        Order.objects.bulk_create_orders([
+            {'customer': self.customer, 'item': 'Laptop Computer', 'amount': Decimal('999.99')},
+            {'customer': self.customer, 'item': 'Mouse Pad', 'amount': Decimal('15.99')},
+        ])
         
-        url = reverse('order-search')
-        response = self.client.get(url, {'q': 'Laptop'})
+        # Token lookup, the match count, and one page of results
+        with self.assertNumQueries(3):
+            response = self.client.get(ORDER_SEARCH_URL, {'q': 'Laptop'})
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['count'], 1)
@@ -223,32 +252,20 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
     
     def test_orders_by_customer(self):
         """Test getting orders by customer."""
-        # Create orders for our customer
-        Order.objects.create(
-            customer=self.customer,
-            item='Product 1',
-            amount=Decimal('50.00')
-        )
-        Order.objects.create(
-            customer=self.customer,
-            item='Product 2',
-            amount=Decimal('75.00')
-        )
-        
-        # Create another customer with orders
+        # Create another customer, then orders for both
         other_customer = Customer.objects.create(
             name='Jane Doe',
             email='jane@example.com',
             phone_number='+254700123457'
         )
-        Order.objects.create(
-            customer=other_customer,
-            item='Other Product',
-            amount=Decimal('30.00')
-        )
+        Order.objects.bulk_create_orders([
+            {'customer': self.customer, 'item': 'Product 1', 'amount': Decimal('50.00')},
+            {'customer': self.customer, 'item': 'Product 2', 'amount': Decimal('75.00')},
+            {'customer': other_customer, 'item': 'Other Product', 'amount': Decimal('30.00')},
+        ])
         
-        url = reverse('order-by-customer')
-        response = self.client.get(url, {'customer_id': str(self.customer.id)})
+        with self.assertNumQueries(2):
+            response = self.client.get(ORDER_BY_CUSTOMER_URL, {'customer_id': str(self.customer.id)})
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['total_orders'], 2)
@@ -267,11 +284,9 @@ class OrderViewSetTest(AuthenticatedAPITestCase):
         self.client.credentials()
         
         # Test list endpoint
-        url = reverse('order-list')
-        response = self.client.get(url)
+        response = self.client.get(ORDER_LIST_URL)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         
         # Test detail endpoint
-        url = reverse('order-detail', kwargs={'pk': order.pk})
-        response = self.client.get(url)
+        response = self.client.get(detail_url(order.pk))
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -5,6 +5,9 @@ from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Sum, Count
 from django.utils import timezone
+from decimal import Decimal
+import logging
+
 from .models import Order
 from .serializers import (
     OrderSerializer,
@@ -12,6 +15,16 @@ from .serializers import (
     OrderListSerializer,
     OrderStatusUpdateSerializer
 )
+from .tasks import send_order_sms_notification
+
+logger = logging.getLogger(__name__)
+
+# Serializer per action; anything else uses OrderSerializer
+ACTION_SERIALIZERS = {
+    'create': OrderCreateSerializer,
+    'list': OrderListSerializer,
+    'update_status': OrderStatusUpdateSerializer,
+}
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -20,7 +33,7 @@ class OrderViewSet(viewsets.ModelViewSet):
     
     Provides CRUD operations for orders with search, filtering, and analytics.
     """
-    queryset = Order.objects.select_related('customer').all()
+    queryset = Order.objects.select_related('customer')
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -29,23 +42,37 @@ class OrderViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'updated_at', 'amount', 'order_number']
     ordering = ['-created_at']
 
+    def get_queryset(self):
+        """Narrow the columns and joins to what each action needs."""
+        queryset = super().get_queryset()
+        if self.action in ('list', 'search', 'by_customer'):
+            # Only the OrderListSerializer fields are rendered, and the
+            # customer name is stored on the order, so no join is needed
+            queryset = queryset.select_related(None).only(
+                'id', 'order_number', 'customer_name', 'item', 'amount',
+                'quantity', 'total_amount', 'status', 'created_at'
+            )
+        elif self.action == 'resend_sms':
+            # Only the id and number are read; the task loads the rest
+            queryset = queryset.select_related(None).only('id', 'order_number')
+        elif self.action == 'analytics':
+            # Aggregates only; the customer join is never read
+            queryset = queryset.select_related(None)
+        return queryset
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
-        if self.action == 'create':
-            return OrderCreateSerializer
-        elif self.action == 'list':
-            return OrderListSerializer
-        elif self.action == 'update_status':
-            return OrderStatusUpdateSerializer
-        return OrderSerializer
+        return ACTION_SERIALIZERS.get(self.action, OrderSerializer)
+
+    def _order_data(self, order):
+        """Full order representation for actions whose own serializer is narrower."""
+        return OrderSerializer(order, context=self.get_serializer_context()).data
 
     def perform_create(self, serializer):
         """Create order and handle additional logic."""
         order = serializer.save()
         # Log order creation
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"New order created: {order.order_number} for customer {order.customer.name}")
+        logger.info("New order created: %s for customer %s", order.order_number, order.customer.name)
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -57,11 +84,9 @@ class OrderViewSet(viewsets.ModelViewSet):
             serializer.save()
             
             # Log status change
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"Order {order.order_number} status updated to {order.status}")
+            logger.info("Order %s status updated to %s", order.order_number, order.status)
             
-            return Response(OrderSerializer(order).data)
+            return Response(self._order_data(order))
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'])
@@ -76,11 +101,11 @@ class OrderViewSet(viewsets.ModelViewSet):
             )
         
         order.status = 'cancelled'
-        order.save()
+        order.save(update_fields=['status', 'updated_at'])
         
         return Response({
             'message': f'Order {order.order_number} has been cancelled',
-            'order': OrderSerializer(order).data
+            'order': self._order_data(order)
         })
 
     @action(detail=True, methods=['post'])
@@ -88,8 +113,10 @@ class OrderViewSet(viewsets.ModelViewSet):
         """Resend SMS notification for an order."""
         order = self.get_object()
         
+        # Clear the sent flag so the task's claim lets this send through
+        Order.objects.filter(id=order.id).update(sms_sent=False, sms_sent_at=None)
+        
         # Trigger SMS notification
-        from .tasks import send_order_sms_notification
         send_order_sms_notification.delay(order.id)
         
         return Response({
@@ -109,19 +136,25 @@ class OrderViewSet(viewsets.ModelViewSet):
         if end_date:
             queryset = queryset.filter(created_at__lte=end_date)
 
-        # Calculate statistics
-        total_orders = queryset.count()
-        total_revenue = queryset.aggregate(total=Sum('amount'))['total'] or 0
-        
-        # Orders by status
-        status_counts = {}
-        for status_choice in Order.STATUS_CHOICES:
-            status_key = status_choice[0]
-            status_counts[status_key] = queryset.filter(status=status_key).count()
-
-        # Recent orders (last 7 days)
+        # Calculate statistics, recent orders (last 7 days) and orders by
+        # status in a single query, using filtered counts
         week_ago = timezone.now() - timezone.timedelta(days=7)
-        recent_orders = queryset.filter(created_at__gte=week_ago).count()
+        totals = queryset.aggregate(
+            total_orders=Count('id'),
+            total_revenue=Sum('amount'),
+            recent_orders=Count('id', filter=Q(created_at__gte=week_ago)),
+            **{
+                f'status_{status_key}': Count('id', filter=Q(status=status_key))
+                for status_key, _ in Order.STATUS_CHOICES
+            }
+        )
+        total_orders = totals['total_orders']
+        total_revenue = totals['total_revenue'] or 0
+        recent_orders = totals['recent_orders']
+        status_counts = {
+            status_key: totals[f'status_{status_key}']
+            for status_key, _ in Order.STATUS_CHOICES
+        }
 
         # Average order value
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
@@ -156,11 +189,11 @@ class OrderViewSet(viewsets.ModelViewSet):
             Q(notes__icontains=query)
         )
 
-        serializer = OrderListSerializer(orders, many=True)
-        return Response({
-            'count': orders.count(),
-            'results': serializer.data
-        })
+        # Paginate so a broad query can't pull every matching order at once
+        # (PAGE_SIZE is set globally, so there is always a page)
+        page = self.paginate_queryset(orders)
+        serializer = OrderListSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def by_customer(self, request):
@@ -170,15 +203,15 @@ class OrderViewSet(viewsets.ModelViewSet):
             return Response({'error': 'customer_id parameter is required'}, 
                           status=status.HTTP_400_BAD_REQUEST)
 
-        orders = self.get_queryset().filter(customer_id=customer_id)
+        orders = list(self.get_queryset().filter(customer_id=customer_id))
         serializer = OrderListSerializer(orders, many=True)
         
-        # Calculate customer statistics
-        total_spent = orders.aggregate(total=Sum('amount'))['total'] or 0
+        # Calculate customer statistics from the fetched rows
+        total_spent = sum((order.amount for order in orders), Decimal('0'))
         
         return Response({
             'customer_id': customer_id,
-            'total_orders': orders.count(),
+            'total_orders': len(orders),
             'total_spent': float(total_spent),
             'orders': serializer.data
         })
@@ -0,0 +1,18 @@
+"""
+Django settings for running the test suite.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Tests create users with known passwords but never need strong hashes;
+# MD5 keeps each create_user()/login in a test from costing an Argon2 hash.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Tests shouldn't need a running Redis
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
@@ -0,0 +1,50 @@
+from django.db import transaction, IntegrityError
+
+
+def save_with_unique_retry(instance, field, generator, attempts, save):
+    """
+    Draw a value for the unique `field` with `generator(instance)` and call
+    `save()`, redrawing up to `attempts` times on a collision.
+
+    The unique constraint detects the rare collision, so no existence query
+    is needed up front.
+    """
+    manager = type(instance)._default_manager
+    for attempt in range(attempts):
+        value = generator(instance)
+        setattr(instance, field, value)
+        try:
+            with transaction.atomic():
+                save()
+            return
+        except IntegrityError:
+            setattr(instance, field, '')
+            # Only retry when the failure was a collision on this field
+            collided = manager.filter(**{field: value}).exists()
+            if not collided or attempt == attempts - 1:
+                raise
+
+
+def assign_unique_values(queryset, objs, field, generator):
+    """
+    Fill the unique `field` of every object in `objs` that lacks one, for
+    bulk_create(), which skips save(). Values that clash within the batch or
+    with an existing row in `queryset` are redrawn.
+    """
+    taken = {getattr(obj, field) for obj in objs if getattr(obj, field)}
+    pending = [obj for obj in objs if not getattr(obj, field)]
+    while pending:
+        for obj in pending:
+            setattr(obj, field, generator(obj))
+        existing = set(
+            queryset.filter(**{f'{field}__in': [getattr(obj, field) for obj in pending]})
+            .values_list(field, flat=True)
+        )
+        retry = []
+        for obj in pending:
+            value = getattr(obj, field)
+            if value in existing or value in taken:
+                retry.append(obj)
+            else:
+                taken.add(value)
+        pending = retry
@@ -1,25 +1,103 @@
+import argparse
+import json
 import os
+import shlex
+import shutil
 import sys
 import subprocess
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from pathlib import Path
 
-def run_command(command, description, check=True):
-    """Run a command and handle output."""
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'savannah_microservice.settings')
+
+# Set once Django's app registry has been loaded in this process
+_DJANGO_READY = False
+
+def _ensure_django():
+    """Set up Django on first use; it's imported late, after requirements are installed."""
+    global _DJANGO_READY
+    if not _DJANGO_READY:
+        import django
+        django.setup()
+        _DJANGO_READY = True
+
+# Development seed data. Orders name their customer by position among the
+# first two customers
+DEV_CUSTOMERS = (
+    {"name": "John Doe", "email": "john.doe@example.com", "phone_number": "+254700123456"},
+    {"name": "Jane Smith", "email": "jane.smith@example.com", "phone_number": "+254700123457"},
+    {"name": "Bob Johnson", "email": "bob.johnson@example.com", "phone_number": "+254700123458"},
+)
+DEV_ORDERS = (
+    (0, {"item": "Laptop Computer", "amount": Decimal("999.99"), "quantity": 1}),
+    (0, {"item": "Wireless Mouse", "amount": Decimal("29.99"), "quantity": 2}),
+    (1, {"item": "Office Chair", "amount": Decimal("199.99"), "quantity": 1}),
+)
+
+# Commands, tokenized once
+CMD_PYTHON_VERSION = ("python", "--version")
+CMD_DOCKER_VERSION = ("docker", "--version")
+CMD_COMPOSE_VERSION = ("docker-compose", "--version")
+CMD_PIP_INSTALL = ("pip", "install", "-r", "requirements.txt")
+CONTAINER_WAIT_TIMEOUT = 60  # seconds for the database containers to turn healthy
+CMD_COMPOSE_UP_HELP = ("docker-compose", "up", "--help")
+CMD_START_CONTAINERS_WAIT = (
+    "docker-compose", "up", "-d", "--wait", "--wait-timeout", str(CONTAINER_WAIT_TIMEOUT), "db", "redis"
+)
+CMD_START_CONTAINERS = ("docker-compose", "up", "-d", "db", "redis")
+
+# Passed prerequisite checks are remembered for a day, per tool binary
+PREREQ_CACHE_PATH = Path.home() / ".savannah_setup_cache.json"
+PREREQ_CACHE_TTL = 24 * 60 * 60
+
+def _load_cache():
+    """Load cached prerequisite results, or an empty cache."""
+    try:
+        return json.loads(PREREQ_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    """Save prerequisite results; a cache that can't be written is skipped."""
+    try:
+        PREREQ_CACHE_PATH.write_text(json.dumps(cache))
+    except OSError:
+        pass
+
+def _tool_fingerprint(tool):
+    """Identify the installed tool by its path and modification time."""
+    path = shutil.which(tool)
+    if path is None:
+        return None
+    return f"{path}:{os.stat(path).st_mtime}"
+
+def run_command(command, description):
+    """Run a command (an argv sequence, or a string to split), streaming its output."""
     print(f" {description}...")
+    if isinstance(command, str):
+        command = shlex.split(command)
     try:
-        if sys.platform == "win32":
-            result = subprocess.run(command, shell=True, check=check, capture_output=True, text=True)
-        else:
-            result = subprocess.run(command.split(), check=check, capture_output=True, text=True)
+        # No shell on any platform: one process per command, not cmd.exe plus the command.
+        # Output is echoed as it arrives; only the tail is kept for the result.
+        tail = deque(maxlen=50)
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        ) as process:
+            for line in process.stdout:
+                sys.stdout.write(line)
+                tail.append(line)
+            returncode = process.wait()
+        output = "".join(tail)
         
-        if result.returncode == 0:
+        if returncode == 0:
             print(f" {description} completed")
-            return True, result.stdout
+            return True, output
         else:
             print(f" {description} failed")
-            print(f"Error: {result.stderr}")
-            return False, result.stderr
+            return False, output
     except Exception as e:
         print(f" {description} failed with exception: {e}")
         return False, str(e)
@@ -28,22 +106,46 @@ def check_prerequisites():
     """Check if required tools are installed."""
     print("Checking prerequisites...")
     
-    # Check Python
-    success, output = run_command("python --version", "Checking Python", False)
-    if not success:
-        print("Python is not installed or not in PATH")
-        return False
+    checks = [
+        (CMD_PYTHON_VERSION, "Checking Python", "Python is not installed or not in PATH"),
+        (CMD_DOCKER_VERSION, "Checking Docker", " Docker is not installed or not running"),
+        (CMD_COMPOSE_VERSION, "Checking Docker Compose", " Docker Compose is not installed"),
+    ]
     
-    # Check Docker
-    success, output = run_command("docker --version", "Checking Docker", False)
-    if not success:
-        print(" Docker is not installed or not running")
-        return False
+    # Skip tools that passed recently and haven't been reinstalled since
+    cache = _load_cache()
+    now = time.time()
+    pending = []
+    for check in checks:
+        tool = check[0][0]
+        fingerprint = _tool_fingerprint(tool)
+        entry = cache.get(tool)
+        if (fingerprint and entry and entry["fingerprint"] == fingerprint
+                and now - entry["checked_at"] < PREREQ_CACHE_TTL):
+            print(f" {check[1]} (cached)")
+        else:
+            pending.append((check, fingerprint))
     
-    # Check Docker Compose
-    success, output = run_command("docker-compose --version", "Checking Docker Compose", False)
-    if not success:
-        print(" Docker Compose is not installed")
+    # The checks are independent, so run them side by side
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            results = list(executor.map(
+                lambda item: run_command(item[0][0], item[0][1]), pending
+            ))
+    else:
+        results = []
+    
+    failures = []
+    for (check, fingerprint), (success, _) in zip(pending, results):
+        if not success:
+            failures.append(check[2])
+        elif fingerprint:
+            cache[check[0][0]] = {"fingerprint": fingerprint, "checked_at": now}
+    
+    if pending:
+        _save_cache(cache)
+    if failures:
+        print(failures[0])
         return False
     
     print(" All prerequisites are satisfied")
@@ -54,148 +156,234 @@ def setup_environment():
     print("\n Setting up environment...")
     
     # Install Python dependencies
-    success, _ = run_command("pip install -r requirements.txt", "Installing Python dependencies")
+    success, _ = run_command(CMD_PIP_INSTALL, "Installing Python dependencies")
     if not success:
         return False
     
     return True
 
+def compose_supports_wait():
+    """Whether docker-compose can wait for healthchecks itself (Compose v2)."""
+    try:
+        result = subprocess.run(CMD_COMPOSE_UP_HELP, capture_output=True, text=True)
+    except OSError:
+        return False
+    return "--wait-timeout" in result.stdout
+
+def wait_healthy(services, timeout=CONTAINER_WAIT_TIMEOUT, interval=0.5):
+    """Poll Docker until the healthcheck of every service reports healthy."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = subprocess.run(["docker-compose", "ps", "-q", *services], capture_output=True, text=True)
+        container_ids = result.stdout.split()
+        if len(container_ids) == len(services):
+            result = subprocess.run(
+                ["docker", "inspect", "-f", "{{.State.Health.Status}}", *container_ids],
+                capture_output=True, text=True
+            )
+            if result.returncode == 0 and result.stdout.split() == ["healthy"] * len(services):
+                return True
+        time.sleep(interval)
+    return False
+
 def setup_database():
     """Set up database containers."""
     print("\n Setting up database...")
     
-    # Start database containers
-    success, _ = run_command("docker-compose up -d db redis", "Starting database containers")
-    if not success:
-        return False
+    # Compose v2 starts the containers and waits for their healthchecks in
+    # one call; older releases don't know --wait, so poll the health instead
+    if compose_supports_wait():
+        success, _ = run_command(CMD_START_CONTAINERS_WAIT, "Starting database containers")
+        if not success:
+            print(" Database containers did not become healthy")
+            return False
+    else:
+        success, _ = run_command(CMD_START_CONTAINERS, "Starting database containers")
+        if not success:
+            return False
+        
+        print(" Waiting for database to be ready...")
+        if not wait_healthy(["db", "redis"]):
+            print(" Database containers are not running properly")
+            return False
+    
+    print(" Database containers are ready")
+    return True
+
+def wait_for_services(timeout=60, interval=0.25):
+    """Ping the configured database and Redis until both accept connections."""
+    import redis
+    from django.conf import settings
+    from django.db import connection, OperationalError
     
-    # Wait for database to be ready
-    print(" Waiting for database to be ready...")
-    time.sleep(15)
+    broker = redis.Redis.from_url(settings.CELERY_BROKER_URL, socket_connect_timeout=2)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection.ensure_connection()
+            broker.ping()
+            return True
+        except (OperationalError, redis.exceptions.ConnectionError):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+def static_files_up_to_date():
+    """Whether the last collectstatic run is newer than every source static file."""
+    from django.apps import apps
+    from django.conf import settings
     
-    # Check if containers are running
-    success, output = run_command("docker-compose ps", "Checking container status", False)
-    if "db" not in output or "redis" not in output:
-        print(" Database containers are not running properly")
+    # The manifest is written last, so its mtime marks a completed run
+    manifest = Path(settings.STATIC_ROOT) / "staticfiles.json"
+    if not manifest.exists():
         return False
     
-    print(" Database containers are ready")
-    return True
+    sources = [Path(directory) for directory in settings.STATICFILES_DIRS]
+    sources += [Path(app.path) / "static" for app in apps.get_app_configs()]
+    collected_at = manifest.stat().st_mtime
+    return all(
+        path.stat().st_mtime <= collected_at
+        for source in sources if source.is_dir()
+        for path in source.rglob("*")
+    )
 
 def setup_django():
     """Set up Django application."""
     print("\n Setting up Django application...")
     
-    # Make migrations
-    success, _ = run_command("python manage.py makemigrations", "Creating migrations")
-    if not success:
-        return False
+    # Run the management commands in this process, loading Django once
+    # instead of starting a fresh interpreter per command
+    _ensure_django()
+    from django.core.management import call_command
     
-    # Apply migrations
-    success, _ = run_command("python manage.py migrate", "Applying migrations")
-    if not success:
+    # Container health says the services are up; make sure they're reachable
+    # from here with the configured settings before migrating
+    if not wait_for_services():
+        print(" Could not connect to the database or Redis")
         return False
     
-    # Collect static files
-    success, _ = run_command("python manage.py collectstatic --noinput", "Collecting static files")
-    # Don't fail if this doesn't work, it's not critical for development
+    try:
+        print(" Creating migrations...")
+        call_command("makemigrations")
+        print(" Applying migrations...")
+        call_command("migrate")
+        print(" Backfilling order columns...")
+        call_command("backfill_orders")
+    except Exception as e:
+        print(f" Django setup failed with exception: {e}")
+        return False
     
     return True
 
+def collect_static_files():
+    """Collect static files unless the collected copy is already current."""
+    _ensure_django()
+    from django.core.management import call_command
+    
+    if static_files_up_to_date():
+        print(" Static files are up to date, skipping collectstatic")
+        return
+    print(" Collecting static files...")
+    try:
+        call_command("collectstatic", interactive=False)
+    except Exception as e:
+        # Don't fail if this doesn't work, it's not critical for development
+        print(f" Collecting static files failed: {e}")
+
 def create_test_data():
     """Create test data for development."""
     print("\n Creating test data...")
     
     try:
         # Set up Django
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'savannah_microservice.settings')
-        import django
-        django.setup()
+        _ensure_django()
         
         from oauth2_provider.models import Application
         from django.contrib.auth.models import User
         from customers.models import Customer
         from orders.models import Order
-        from decimal import Decimal
+        from django.db import transaction
         
-        # Create OAuth2 application
-        if not Application.objects.filter(name="Development App").exists():
-            app = Application.objects.create(
+        # One transaction for all of the test data
+        with transaction.atomic():
+            # Create OAuth2 application
+            app, created = Application.objects.get_or_create(
                 name="Development App",
-                client_type=Application.CLIENT_CONFIDENTIAL,
-                authorization_grant_type=Application.GRANT_AUTHORIZATION_CODE,
-            )
-            print(f" Created OAuth2 application")
-            print(f"   Client ID: {app.client_id}")
-            print(f"   Client Secret: {app.client_secret}")
-            
-            # Save credentials to a file for easy access
-            with open("oauth_credentials.txt", "w") as f:
-                f.write(f"Client ID: {app.client_id}\n")
-                f.write(f"Client Secret: {app.client_secret}\n")
-        
-        # Create test customers
-        if not Customer.objects.exists():
-            customers_data = [
-                {
-                    "name": "John Doe",
-                    "email": "john.doe@example.com",
-                    "phone_number": "+254700123456"
-                },
-                {
-                    "name": "Jane Smith", 
-                    "email": "jane.smith@example.com",
-                    "phone_number": "+254700123457"
+                defaults={
+                    "client_type": Application.CLIENT_CONFIDENTIAL,
+                    "authorization_grant_type": Application.GRANT_AUTHORIZATION_CODE,
                 },
-                {
-                    "name": "Bob Johnson",
-                    "email": "bob.johnson@example.com", 
-                    "phone_number": "+254700123458"
-                }
-            ]
-            
-            for customer_data in customers_data:
-                Customer.objects.create(**customer_data)
-            
-            print(f" Created {len(customers_data)} test customers")
-        
-        # Create test orders
-        if not Order.objects.exists() and Customer.objects.exists():
-            customers = Customer.objects.all()[:2]  # Get first 2 customers
-            orders_data = [
-                {
-                    "customer": customers[0],
-                    "item": "Laptop Computer",
-                    "amount": Decimal("999.99"),
-                    "quantity": 1
-                },
-                {
-                    "customer": customers[0],
-                    "item": "Wireless Mouse",
-                    "amount": Decimal("29.99"),
-                    "quantity": 2
-                },
-                {
-                    "customer": customers[1],
-                    "item": "Office Chair",
-                    "amount": Decimal("199.99"),
-                    "quantity": 1
-                }
-            ]
+            )
+            if created:
+                print(f" Created OAuth2 application")
+                print(f"   Client ID: {app.client_id}")
+                print(f"   Client Secret: {app.client_secret}")
+                
+                # Save credentials to a file for easy access
+                with open("oauth_credentials.txt", "w") as f:
+                    f.write(f"Client ID: {app.client_id}\n")
+                    f.write(f"Client Secret: {app.client_secret}\n")
             
-            for order_data in orders_data:
-                Order.objects.create(**order_data)
+            # Create test customers
+            if not Customer.objects.exists():
+                Customer.objects.bulk_create_customers(DEV_CUSTOMERS)
+                
+                print(f" Created {len(DEV_CUSTOMERS)} test customers")
             
-            print(f" Created {len(orders_data)} test orders")
+            # Create test orders
+            if not Order.objects.exists() and Customer.objects.exists():
+                # First 2 customers; orders only need their id and name
+                customers = list(Customer.objects.only("id", "name")[:2])
+                Order.objects.bulk_create_orders([
+                    {**order, "customer": customers[index]} for index, order in DEV_ORDERS
+                ])
+                
+                print(f" Created {len(DEV_ORDERS)} test orders")
         
         return True
         
     except Exception as e:
         print(f" Failed to create test data: {e}")
         return False
+    finally:
+        # May run on a worker thread, which owns its own database connection
+        from django.db import connection
+        connection.close()
+
+# Setup pipeline: (name, label, steps, fatal). The steps of a stage run side
+# by side; a fatal stage that fails stops the setup. Installing requirements
+# doesn't touch the containers, and test data only touches the database while
+# collectstatic only touches the filesystem.
+STAGES = (
+    ("prerequisites", "Prerequisites", (check_prerequisites,), True),
+    ("services", "Environment and database", (setup_environment, setup_database), True),
+    ("django", "Django", (setup_django,), True),
+    ("data", "Test data and static files", (create_test_data, collect_static_files), False),
+)
+STAGE_NAMES = [name for name, _, _, _ in STAGES]
+
+def run_stage(steps):
+    """Run a stage's steps, concurrently when there are several; True if all succeeded."""
+    if len(steps) == 1:
+        return steps[0]() is not False
+    with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+        futures = [executor.submit(step) for step in steps]
+    return all(future.result() is not False for future in futures)
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Set up the Savannah Microservice development environment.")
+    parser.add_argument(
+        "--stage",
+        choices=STAGE_NAMES,
+        default=STAGES[0][0],
+        help="start from this stage, skipping the ones before it",
+    )
+    return parser.parse_args()
 
 def main():
     """Main setup function."""
+    args = parse_args()
     print("Savannah Microservice Complete Setup")
     print("=" * 50)
     
@@ -204,28 +392,13 @@ def main():
         print(" Please run this script from the project root directory (where manage.py is located)")
         sys.exit(1)
     
-    # Check prerequisites
-    if not check_prerequisites():
-        print("\n Prerequisites check failed. Please install missing tools and try again.")
-        sys.exit(1)
-    
-    # Setup environment
-    if not setup_environment():
-        print("\n Environment setup failed.")
-        sys.exit(1)
-    
-    # Setup database
-    if not setup_database():
-        print("\n Database setup failed.")
-        sys.exit(1)
-    
-    # Setup Django
-    if not setup_django():
-        print("\n Django setup failed.")
-        sys.exit(1)
-    
-    # Create test data
-    create_test_data()
+    for _, label, steps, fatal in STAGES[STAGE_NAMES.index(args.stage):]:
+        started = time.perf_counter()
+        ok = run_stage(steps)
+        print(f"\n [{label}] {time.perf_counter() - started:.2f}s")
+        if not ok and fatal:
+            print(f"\n {label} failed.")
+            sys.exit(1)
     
     print("\n Setup completed successfully!")
     print("\n Summary:")
@@ -16,13 +16,22 @@ fi
 
 echo "✅ Docker and Docker Compose are available"
 
-# Start PostgreSQL and Redis containers
+# Start PostgreSQL and Redis containers, waiting up to 60 seconds for their
+# healthchecks (Compose v2); older releases without --wait fall back to a
+# fixed delay
 echo "🐘 Starting PostgreSQL and Redis containers..."
-docker-compose up -d db redis
+if docker-compose up --help 2>/dev/null | grep -q -- --wait-timeout; then
+    if ! docker-compose up -d --wait --wait-timeout 60 db redis; then
+        echo "❌ Database containers did not become healthy"
+        docker-compose logs db redis
+        exit 1
+    fi
+else
+    docker-compose up -d db redis
 
-# Wait for PostgreSQL to be ready
-echo "⏳ Waiting for PostgreSQL to be ready..."
-sleep 10
+    echo "⏳ Waiting for PostgreSQL to be ready..."
+    sleep 10
+fi
 
 # Check if containers are running
 if docker-compose ps | grep -q "db.*Up"; then
@@ -5,7 +5,7 @@ Django Database Setup Script for Savannah Microservice
 import os
 import sys
 import django
-import subprocess
+from django.core.management import call_command
 from pathlib import Path
 
 # Add the project directory to Python path
@@ -15,24 +15,32 @@ sys.path.insert(0, str(BASE_DIR))
 # Set Django settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'savannah_microservice.settings')
 
-def run_command(command, description):
-    """Run a shell command and handle errors."""
+# Set once Django's app registry has been loaded in this process
+_DJANGO_READY = False
+
+def _ensure_django():
+    """Set up Django on first use only."""
+    global _DJANGO_READY
+    if not _DJANGO_READY:
+        django.setup()
+        _DJANGO_READY = True
+
+def run_management_command(name, description, **options):
+    """Run a Django management command in this process and handle errors."""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        call_command(name, **options)
         print(f"✅ {description} completed successfully")
-        if result.stdout:
-            print(result.stdout)
         return True
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"❌ {description} failed")
-        print(f"Error: {e.stderr}")
+        print(f"Error: {e}")
         return False
 
 def check_database_connection():
     """Check if database connection is working."""
     try:
-        django.setup()
+        _ensure_django()
         from django.db import connection
         with connection.cursor() as cursor:
             cursor.execute("SELECT 1")
@@ -45,17 +53,19 @@ def check_database_connection():
 def create_initial_data():
     """Create initial data for the application."""
     try:
-        django.setup()
+        _ensure_django()
         from oauth2_provider.models import Application
         from django.contrib.auth.models import User
         
         # Create OAuth2 application for testing
-        if not Application.objects.filter(name="Test Application").exists():
-            app = Application.objects.create(
-                name="Test Application",
-                client_type=Application.CLIENT_CONFIDENTIAL,
-                authorization_grant_type=Application.GRANT_AUTHORIZATION_CODE,
-            )
+        app, created = Application.objects.get_or_create(
+            name="Test Application",
+            defaults={
+                "client_type": Application.CLIENT_CONFIDENTIAL,
+                "authorization_grant_type": Application.GRANT_AUTHORIZATION_CODE,
+            },
+        )
+        if created:
             print(f"✅ Created OAuth2 test application")
             print(f"   Client ID: {app.client_id}")
             print(f"   Client Secret: {app.client_secret}")
@@ -85,14 +95,17 @@ def main():
         sys.exit(1)
     
     # Run migrations
-    if not run_command("python manage.py makemigrations", "Creating migrations"):
+    if not run_management_command("makemigrations", "Creating migrations"):
+        sys.exit(1)
+    
+    if not run_management_command("migrate", "Applying migrations"):
         sys.exit(1)
     
-    if not run_command("python manage.py migrate", "Applying migrations"):
+    if not run_management_command("backfill_orders", "Backfilling order columns"):
         sys.exit(1)
     
     # Collect static files
-    if not run_command("python manage.py collectstatic --noinput", "Collecting static files"):
+    if not run_management_command("collectstatic", "Collecting static files", interactive=False):
         print("⚠️  Static files collection failed, but continuing...")
     
     # Create initial data
@@ -3,9 +3,10 @@ from django.test import TestCase
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
 from oauth2_provider.models import Application, AccessToken
+from customers.models import Customer
 from django.utils import timezone
 from datetime import timedelta
-import uuid
+import secrets
 
 
 @pytest.fixture
@@ -40,29 +41,49 @@ def access_token(user, oauth_application):
     )
 
 
+def make_customers(n):
+    """Create `n` customers with a single bulk insert."""
+    return Customer.objects.bulk_create_customers([
+        {
+            'name': f'Customer {i}',
+            'email': f'customer{i}@example.com',
+            'phone_number': f'+254700{i:06d}'
+        }
+        for i in range(1, n + 1)
+    ])
+
+
 class AuthenticatedAPITestCase(APITestCase):
-    """Base test case with authentication setup."""
+    """
+    Base test case with authentication setup.
     
-    def setUp(self):
-        self.user = User.objects.create_user(
+    The user, application and token are created once per class (hashing the
+    password is the slow part); subclasses overriding setUpTestData must call
+    super().setUpTestData().
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
-        self.application = Application.objects.create(
+        cls.application = Application.objects.create(
             name="Test Application",
             client_type=Application.CLIENT_CONFIDENTIAL,
             authorization_grant_type=Application.GRANT_AUTHORIZATION_CODE,
         )
         
-        self.access_token = AccessToken.objects.create(
-            user=self.user,
-            application=self.application,
-            token=str(uuid.uuid4()),
+        cls.access_token = AccessToken.objects.create(
+            user=cls.user,
+            application=cls.application,
+            token=secrets.token_urlsafe(32),
             expires=timezone.now() + timedelta(hours=1),
             scope='read write'
         )
-        
+    
+    def setUp(self):
         # Set authentication header
         self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access_token.token}')
@@ -0,0 +1,42 @@
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from savannah_microservice.renderers import ORJSONRenderer
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+import uuid
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """Test that ORJSONRenderer output matches DRF's JSONRenderer."""
+    
+    def assertRendersLikeDRF(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+    
+    def test_decimal(self):
+        """Test Decimal values render like DRF."""
+        self.assertRendersLikeDRF({'amount': Decimal('99.99'), 'total': Decimal('0')})
+    
+    def test_datetime(self):
+        """Test aware, UTC and naive datetimes render like DRF."""
+        self.assertRendersLikeDRF({
+            'utc': datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+            'local': timezone.localtime(datetime(2024, 1, 2, 3, 4, 5, tzinfo=dt_timezone.utc)),
+            'naive': datetime(2024, 1, 2, 3, 4, 5),
+            'date': datetime(2024, 1, 2).date(),
+        })
+    
+    def test_non_str_keys(self):
+        """Test int keys render like DRF and UUID keys as their string form."""
+        self.assertRendersLikeDRF({1: 'one', 2: 'two'})
+        
+        key = uuid.uuid4()
+        self.assertEqual(ORJSONRenderer().render({key: 1}), f'{{"{key}":1}}'.encode())
+    
+    def test_unicode(self):
+        """Test non-ASCII text and line/paragraph separators render like DRF."""
+        self.assertRendersLikeDRF({'name': 'Zoë Wanjirũ ☕', 'notes': 'line\u2028para\u2029end'})
+    
+    def test_uuid_values(self):
+        """Test UUID values render like DRF."""
+        self.assertRendersLikeDRF({'id': uuid.uuid4(), 'ids': [uuid.uuid4()]})
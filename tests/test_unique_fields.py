@@ -0,0 +1,51 @@
+from django.test import TestCase
+from django.db import IntegrityError
+from unittest.mock import patch
+from customers.models import Customer
+
+
+class UniqueFieldsTest(TestCase):
+    """Test cases for drawing unique generated values."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.existing = Customer.objects.create(
+            name='John Doe',
+            email='john@example.com',
+            phone_number='+254700123456',
+            code='CUST000001'
+        )
+    
+    @patch.object(Customer, 'generate_customer_code', side_effect=['CUST000001', 'CUST000002'])
+    def test_save_redraws_colliding_value(self, mock_generate):
+        """Test save() draws a new code when the first one is taken."""
+        customer = Customer.objects.create(
+            name='Jane Smith',
+            email='jane@example.com',
+            phone_number='+254700123457'
+        )
+        
+        self.assertEqual(customer.code, 'CUST000002')
+        self.assertEqual(mock_generate.call_count, 2)
+    
+    @patch.object(Customer, 'generate_customer_code', side_effect=['CUST000001'] * 3)
+    def test_save_gives_up_after_attempts(self, mock_generate):
+        """Test save() re-raises once every attempt collided."""
+        with self.assertRaises(IntegrityError):
+            Customer.objects.create(
+                name='Jane Smith',
+                email='jane@example.com',
+                phone_number='+254700123457'
+            )
+        
+        self.assertEqual(mock_generate.call_count, 3)
+    
+    @patch.object(Customer, 'generate_customer_code', side_effect=['CUST000001', 'CUST000002', 'CUST000002', 'CUST000003'])
+    def test_bulk_redraws_values_taken_in_batch_or_table(self, mock_generate):
+        """Test bulk creation redraws codes clashing with existing rows or each other."""
+        customers = Customer.objects.bulk_create_customers([
+            {'name': 'Jane Smith', 'email': 'jane@example.com', 'phone_number': '+254700123457'},
+            {'name': 'Bob Johnson', 'email': 'bob@example.com', 'phone_number': '+254700123458'},
+        ])
+        
+        self.assertEqual(sorted(customer.code for customer in customers), ['CUST000002', 'CUST000003'])